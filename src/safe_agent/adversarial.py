@@ -5,7 +5,6 @@ from __future__ import annotations
 import asyncio
 import io
 import json
-import os
 from dataclasses import dataclass
 from pathlib import Path
 from tempfile import TemporaryDirectory
@@ -84,6 +83,12 @@ async def _run_case(case: dict[str, Any], *, workdir: str) -> dict[str, Any]:
         "passed": passed,
     }
 
+
+async def _run_cases(cases: list[dict[str, Any]], *, workdir: str) -> list[dict[str, Any]]:
+    """Evaluate all cases in order on a single event loop."""
+    return [await _run_case(case, workdir=workdir) for case in cases]
+
+
 class _ConsoleSwap:
     def __init__(self, *, enabled: bool) -> None:
         self._enabled = enabled
@@ -118,20 +123,12 @@ def run_adversarial_suite(
     verbose: bool = False,
 ) -> dict[str, Any]:
     """Run adversarial fixtures against SafeAgent and return a structured report."""
-    previous_key = os.environ.get("ANTHROPIC_API_KEY")
-    if not previous_key:
-        os.environ["ANTHROPIC_API_KEY"] = "adversarial-suite-placeholder"
-
-    try:
-        with _ConsoleSwap(enabled=not verbose):
-            if workdir is not None:
-                results = [asyncio.run(_run_case(case, workdir=workdir)) for case in cases]
-            else:
-                with TemporaryDirectory(prefix="safe-agent-adversarial-") as tmp:
-                    results = [asyncio.run(_run_case(case, workdir=tmp)) for case in cases]
-    finally:
-        if previous_key is None:
-            os.environ.pop("ANTHROPIC_API_KEY", None)
+    with _ConsoleSwap(enabled=not verbose):
+        if workdir is not None:
+            results = asyncio.run(_run_cases(cases, workdir=workdir))
+        else:
+            with TemporaryDirectory(prefix="safe-agent-adversarial-") as tmp:
+                results = asyncio.run(_run_cases(cases, workdir=tmp))
 
     passed = sum(1 for item in results if item["passed"])
     failed = len(results) - passed
@@ -4,13 +4,15 @@ Safe Agent - Core agent logic with impact preview integration.
 
 from __future__ import annotations
 
+import asyncio
+import copy
 import os
 from collections import Counter
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any, Literal
 
-import anthropic
 from rich.console import Console
+from rich.markup import escape
 from rich.panel import Panel
 from rich.prompt import Confirm
 from rich.syntax import Syntax
@@ -22,9 +24,49 @@ from agent_polis.actions.diff import format_diff_plain
 from agent_polis.actions.models import ActionRequest, ActionType, RiskLevel
 
 from safe_agent import __version__ as SAFE_AGENT_VERSION
+from safe_agent.risk import risk_severity
+
+if TYPE_CHECKING:
+    import anthropic
+
+try:
+    import orjson
+except ModuleNotFoundError:  # optional: pip install "safe-agent-cli[speedups]"
+    orjson = None
+
+try:
+    import zstandard
+except ModuleNotFoundError:  # optional: pip install "safe-agent-cli[zstd]"
+    zstandard = None
 
 console = Console()
 
+# Audits larger than this are zstd-compressed when compression is set to "auto".
+_AUDIT_ZSTD_THRESHOLD_BYTES = 32 * 1024
+_ZSTD_INSTALL_HINT = "pip install 'safe-agent-cli[zstd]'"
+
+
+def _check_audit_compress(name: str, value: object) -> None:
+    """Reject anything other than the supported audit compression modes."""
+    if value is not True and value is not False and value != "auto":
+        raise ValueError(f"{name} must be True, False or 'auto' (got {value!r})")
+
+
+def _dump_audit_json(data: dict[str, Any]) -> bytes:
+    """Serialize an audit payload to indented UTF-8 JSON, using orjson when available."""
+    if orjson is not None:
+        # Audit keys are always strings, so no OPT_NON_STR_KEYS coercion pass is needed.
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+
+    import json
+
+    return json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+def _write_audit_file(target: Path, payload: bytes) -> None:
+    """Write a serialized audit payload to disk."""
+    target.write_bytes(payload)
+
 
 class SafeAgent:
     """
@@ -45,6 +87,7 @@ class SafeAgent:
         compliance_mode: bool = False,
         policy_path: str | None = None,
         policy_preset: str | None = None,
+        audit_compress: bool | Literal["auto"] = False,
     ):
         self.model = model
         self.auto_approve_low_risk = auto_approve_low_risk and not compliance_mode
@@ -53,13 +96,19 @@ class SafeAgent:
         self.non_interactive = non_interactive
         self.fail_on_risk = fail_on_risk
         self.audit_export_path = audit_export_path
+        _check_audit_compress("audit_compress", audit_compress)
+        if audit_compress is True and zstandard is None:
+            raise ValueError(f"zstd audit compression requires: {_ZSTD_INSTALL_HINT}")
+        self.audit_compress = audit_compress
         self.compliance_mode = compliance_mode
 
         # Compliance mode enforces strict settings
         if compliance_mode:
             self.auto_approve_low_risk = False
 
-        self.client = anthropic.Anthropic()
+        # Created on first use (see ``client``): building it loads the system CA bundle,
+        # which dominates construction cost and is wasted on offline preview/audit paths.
+        self._client: anthropic.Anthropic | None = None
         self.analyzer = ImpactAnalyzer(working_directory=self.working_directory)
 
         # Track changes for summary
@@ -70,6 +119,11 @@ class SafeAgent:
         self.governance_policy_failed = False
         self.governance_policy_reason: str | None = None
         self._governance_events: list[dict[str, Any]] = []
+        # Running aggregates over _governance_events, maintained by _record_governance_event.
+        self._outcome_counts: Counter[str] = Counter()
+        self._risk_counts: Counter[str] = Counter()
+        self._blocking_rule_ids: set[str] = set()
+        self._scanner_reason_ids: set[str] = set()
 
         # Audit trail tracking
         self.audit_trail: dict[str, Any] = {
@@ -96,6 +150,20 @@ class SafeAgent:
         self._scanner: Any | None = None
         self._init_governance(policy_path=policy_path, policy_preset=policy_preset)
 
+    @property
+    def client(self) -> anthropic.Anthropic:
+        """Anthropic API client, created on first access."""
+        if self._client is None:
+            # Imported here: the SDK is only needed for planning and is slow to import.
+            import anthropic
+
+            self._client = anthropic.Anthropic()
+        return self._client
+
+    @client.setter
+    def client(self, value: anthropic.Anthropic) -> None:
+        self._client = value
+
     def _init_governance(self, *, policy_path: str | None, policy_preset: str | None) -> None:
         """
         Initialize policy evaluator + prompt scanner.
@@ -229,21 +297,11 @@ class SafeAgent:
             return None
         return resolved
 
-    @staticmethod
-    def _risk_severity(level: RiskLevel) -> int:
-        order = {
-            RiskLevel.LOW: 0,
-            RiskLevel.MEDIUM: 1,
-            RiskLevel.HIGH: 2,
-            RiskLevel.CRITICAL: 3,
-        }
-        return order.get(level, 99)
-
     def _note_risk(self, level: RiskLevel) -> None:
         if self.max_risk_level_seen is None:
             self.max_risk_level_seen = level
             return
-        if self._risk_severity(level) > self._risk_severity(self.max_risk_level_seen):
+        if risk_severity(level) > risk_severity(self.max_risk_level_seen):
             self.max_risk_level_seen = level
 
     def _evaluate_governance(self, request: ActionRequest, risk_level: RiskLevel) -> tuple[Any, Any]:
@@ -277,23 +335,17 @@ class SafeAgent:
                 "outcome": outcome,
             }
         )
+        self._outcome_counts[outcome] += 1
+        if risk_level is not None:
+            self._risk_counts[risk_level.value.upper()] += 1
+        if outcome == "blocked_by_policy_deny" and matched_rule_id:
+            self._blocking_rule_ids.add(matched_rule_id)
+        self._scanner_reason_ids.update(scanner_reason_ids)
 
     def _recommended_next_actions(self) -> list[str]:
         actions: list[str] = []
-        blocking_rule_ids = sorted(
-            {
-                event["matched_rule_id"]
-                for event in self._governance_events
-                if event.get("outcome") == "blocked_by_policy_deny" and event.get("matched_rule_id")
-            }
-        )
-        scanner_reason_ids = sorted(
-            {
-                reason
-                for event in self._governance_events
-                for reason in event.get("scanner_reason_ids", [])
-            }
-        )
+        blocking_rule_ids = sorted(self._blocking_rule_ids)
+        scanner_reason_ids = sorted(self._scanner_reason_ids)
 
         if blocking_rule_ids:
             actions.append(
@@ -304,7 +356,7 @@ class SafeAgent:
             actions.append(
                 f"Reduce change risk or adjust --fail-on-risk (currently {self.fail_on_risk.value})."
             )
-        if any(event.get("outcome") == "blocked_non_interactive_requires_approval" for event in self._governance_events):
+        if self._outcome_counts["blocked_non_interactive_requires_approval"]:
             actions.append("Re-run interactively for manual approvals or use a more permissive preset.")
         if scanner_reason_ids:
             actions.append(
@@ -320,20 +372,8 @@ class SafeAgent:
         status = "FAIL" if (self.risk_policy_failed or self.governance_policy_failed) else "PASS"
         status_icon = "❌" if status == "FAIL" else "✅"
         max_risk = self.max_risk_level_seen.value.upper() if self.max_risk_level_seen else "NONE"
-        blocking_rule_ids = sorted(
-            {
-                event["matched_rule_id"]
-                for event in self._governance_events
-                if event.get("outcome") == "blocked_by_policy_deny" and event.get("matched_rule_id")
-            }
-        )
-        scanner_reason_ids = sorted(
-            {
-                reason
-                for event in self._governance_events
-                for reason in event.get("scanner_reason_ids", [])
-            }
-        )
+        blocking_rule_ids = sorted(self._blocking_rule_ids)
+        scanner_reason_ids = sorted(self._scanner_reason_ids)
 
         lines = [
             "### Safe Agent CI Summary",
@@ -356,17 +396,19 @@ class SafeAgent:
             lines.append(f"  - {action}")
         return "\n".join(lines)
 
+    def build_audit_export(self) -> dict[str, Any]:
+        """Build a copy of the audit trail exactly as ``export_audit_trail`` serializes it.
+
+        The trail is complete once ``run()`` has returned; mutating the copy does not
+        affect the agent.
+        """
+        return copy.deepcopy(self.audit_trail)
+
     def build_policy_report(self) -> dict[str, Any]:
         """Build machine-readable policy/scanner report for CI artifacts."""
         status = "failed" if (self.risk_policy_failed or self.governance_policy_failed) else "passed"
         max_risk = self.max_risk_level_seen.value if self.max_risk_level_seen else None
-        blocking_rule_ids = sorted(
-            {
-                event["matched_rule_id"]
-                for event in self._governance_events
-                if event.get("outcome") == "blocked_by_policy_deny" and event.get("matched_rule_id")
-            }
-        )
+        blocking_rule_ids = sorted(self._blocking_rule_ids)
         return {
             "status": status,
             "policy_source": self._policy_source,
@@ -382,8 +424,7 @@ class SafeAgent:
 
     def build_machine_report(self, *, run_success: bool) -> dict[str, Any]:
         """Build compact machine output suitable for adapters and workers."""
-        outcomes = {event.get("outcome") for event in self._governance_events}
-        if "blocked_non_interactive_requires_approval" in outcomes:
+        if self._outcome_counts["blocked_non_interactive_requires_approval"]:
             run_status = "requires_approval"
         elif self.risk_policy_failed or self.governance_policy_failed:
             run_status = "blocked"
@@ -419,19 +460,9 @@ class SafeAgent:
         status_icon = "❌" if status == "FAIL" else "✅"
         max_risk = self.max_risk_level_seen.value.upper() if self.max_risk_level_seen else "NONE"
 
-        outcome_counts = Counter(event.get("outcome", "unknown") for event in self._governance_events)
-        risk_counts = Counter(
-            str(event["risk_level"]).upper()
-            for event in self._governance_events
-            if event.get("risk_level") is not None
-        )
-        scanner_reason_ids = sorted(
-            {
-                reason
-                for event in self._governance_events
-                for reason in event.get("scanner_reason_ids", [])
-            }
-        )
+        outcome_counts = self._outcome_counts
+        risk_counts = self._risk_counts
+        scanner_reason_ids = sorted(self._scanner_reason_ids)
         generated_at = datetime.datetime.now(datetime.timezone.utc).isoformat()
 
         lines = [
@@ -496,8 +527,9 @@ class SafeAgent:
 
             # Finalize and export audit trail even for no-op tasks
             self._finalize_audit_trail(task)
+            exported = None
             if self.audit_export_path:
-                self.export_audit_trail()
+                exported = await asyncio.to_thread(self.export_audit_trail)
 
             return {
                 "success": True,
@@ -507,6 +539,7 @@ class SafeAgent:
                 "risk_policy_failed": False,
                 "governance_policy_failed": False,
                 "governance_policy_reason": None,
+                "audit_export_path": str(exported) if exported else None,
             }
         
         # Show plan
@@ -530,8 +563,10 @@ class SafeAgent:
 
         # Finalize and export audit trail
         self._finalize_audit_trail(task)
+        exported = None
         if self.audit_export_path:
-            self.export_audit_trail()
+            # Serialize and write off the event loop; the file exists once run() returns.
+            exported = await asyncio.to_thread(self.export_audit_trail)
 
         success = not (self.risk_policy_failed or self.governance_policy_failed)
         return {
@@ -542,6 +577,7 @@ class SafeAgent:
             "risk_policy_failed": self.risk_policy_failed,
             "governance_policy_failed": self.governance_policy_failed,
             "governance_policy_reason": self.governance_policy_reason,
+            "audit_export_path": str(exported) if exported else None,
         }
     
     async def _plan_changes(self, task: str) -> dict[str, Any]:
@@ -651,7 +687,7 @@ Rules:
         if resolved_path is None:
             console.print(f"[red]Unsafe path rejected (outside working directory): {path}[/red]")
             self._note_risk(RiskLevel.CRITICAL)
-            if self.fail_on_risk and self._risk_severity(RiskLevel.CRITICAL) >= self._risk_severity(
+            if self.fail_on_risk and risk_severity(RiskLevel.CRITICAL) >= risk_severity(
                 self.fail_on_risk
             ):
                 self.risk_policy_failed = True
@@ -704,7 +740,7 @@ Rules:
 
         policy_triggered = bool(
             self.fail_on_risk
-            and self._risk_severity(preview.risk_level) >= self._risk_severity(self.fail_on_risk)
+            and risk_severity(preview.risk_level) >= risk_severity(self.fail_on_risk)
         )
         if policy_triggered:
             self.risk_policy_failed = True
@@ -939,9 +975,7 @@ Rules:
         }
 
         # Update summary
-        policy_violations = sum(
-            1 for event in self._governance_events if event.get("outcome") == "blocked_by_policy_deny"
-        )
+        policy_violations = self._outcome_counts["blocked_by_policy_deny"]
         self.audit_trail["summary"] = {
             "total_changes_planned": len(self.changes_made) + len(self.changes_rejected),
             "changes_approved": len(self.changes_made),
@@ -963,17 +997,52 @@ Rules:
             "audit_trail_complete": True,
         }
 
-    def export_audit_trail(self, path: str | None = None) -> None:
-        """Export audit trail to JSON file."""
-        import json
-
+    def export_audit_trail(
+        self,
+        path: str | None = None,
+        *,
+        compress: bool | Literal["auto"] | None = None,
+    ) -> Path | None:
+        """Export audit trail to JSON file.
+
+        When compression applies (``compress=True``, or ``"auto"`` with a payload over
+        32 KiB) the audit is written zstd-compressed to ``<path>.zst`` instead. If
+        ``zstandard`` is not installed the audit is still written, as plain JSON.
+        A file in the other format left by an earlier export is removed.
+        Returns the path actually written, or None when nothing was exported.
+        """
         export_path = path or self.audit_export_path
         if not export_path:
-            return
+            return None
+        if compress is None:
+            compress = self.audit_compress
+        else:
+            _check_audit_compress("compress", compress)
+
+        if compress is True and zstandard is None:
+            console.print(
+                "\n[yellow]Warning: zstd audit compression unavailable, writing plain JSON "
+                f"({escape(_ZSTD_INSTALL_HINT)})[/yellow]"
+            )
+            compress = False
 
         try:
-            with open(export_path, "w", encoding="utf-8") as f:
-                json.dump(self.audit_trail, f, indent=2, ensure_ascii=False)
-            console.print(f"\n[dim]Audit trail exported to: {export_path}[/dim]")
+            plain = Path(export_path)
+            compressed = plain.with_name(f"{plain.name}.zst")
+            target = plain
+            payload = _dump_audit_json(self.audit_trail)
+            if compress is True or (
+                compress == "auto"
+                and zstandard is not None
+                and len(payload) > _AUDIT_ZSTD_THRESHOLD_BYTES
+            ):
+                payload = zstandard.ZstdCompressor(level=3).compress(payload)
+                target = compressed
+            _write_audit_file(target, payload)
+            # Drop the other format left by an earlier export so only this audit remains.
+            (plain if target is compressed else compressed).unlink(missing_ok=True)
+            console.print(f"\n[dim]Audit trail exported to: {target}[/dim]")
+            return target
         except Exception as e:
             console.print(f"\n[yellow]Warning: Failed to export audit trail: {e}[/yellow]")
+            return None
@@ -21,16 +21,36 @@ from rich.panel import Panel
 from safe_agent import __version__
 from safe_agent.agent import SafeAgent
 
+try:
+    import orjson
+except ModuleNotFoundError:  # optional: pip install "safe-agent-cli[speedups]"
+    orjson = None
+
 console = Console()
 
 
-def _write_json_artifact(path: str, payload: dict) -> Path:
+def _write_artifact_bytes(path: str, data: bytes) -> Path:
     output_path = Path(path)
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    output_path.write_text(json.dumps(payload, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    output_path.write_bytes(data)
     return output_path
 
 
+def _write_text_artifact(path: str, text: str) -> Path:
+    return _write_artifact_bytes(path, (text + "\n").encode("utf-8"))
+
+
+def _write_json_artifact(path: str, payload: dict) -> Path:
+    if orjson is not None:
+        data = orjson.dumps(
+            payload,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE,
+        )
+    else:
+        data = (json.dumps(payload, indent=2, ensure_ascii=False) + "\n").encode("utf-8")
+    return _write_artifact_bytes(path, data)
+
+
 def _build_machine_output(agent: Any, result: dict) -> dict:
     if hasattr(agent, "build_machine_report"):
         report = agent.build_machine_report(run_success=bool(result.get("success", False)))  # type: ignore[attr-defined]
@@ -228,14 +248,10 @@ def main(
         console.print(markdown)
 
         if adversarial_json_out:
-            json_path = Path(adversarial_json_out)
-            json_path.parent.mkdir(parents=True, exist_ok=True)
-            json_path.write_text(json.dumps(result, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+            json_path = _write_json_artifact(adversarial_json_out, result)
             console.print(f"[dim]Adversarial JSON report written to: {json_path}[/dim]")
         if adversarial_markdown_out:
-            md_path = Path(adversarial_markdown_out)
-            md_path.parent.mkdir(parents=True, exist_ok=True)
-            md_path.write_text(markdown + "\n", encoding="utf-8")
+            md_path = _write_text_artifact(adversarial_markdown_out, markdown)
             console.print(f"[dim]Adversarial markdown report written to: {md_path}[/dim]")
 
         if not result.get("all_passed", False):
@@ -363,16 +379,12 @@ def main(
                 console.print()
                 console.print(summary)
             if ci_summary_file:
-                summary_path = Path(ci_summary_file)
-                summary_path.parent.mkdir(parents=True, exist_ok=True)
-                summary_path.write_text(summary + "\n", encoding="utf-8")
+                summary_path = _write_text_artifact(ci_summary_file, summary)
                 console.print(f"[dim]CI summary written to: {summary_path}[/dim]")
 
         if policy_report:
             report = runner.build_policy_report()
-            report_path = Path(policy_report)
-            report_path.parent.mkdir(parents=True, exist_ok=True)
-            report_path.write_text(json.dumps(report, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+            report_path = _write_json_artifact(policy_report, report)
             console.print(f"[dim]Policy report written to: {report_path}[/dim]")
 
         if safety_scorecard or safety_scorecard_file:
@@ -381,9 +393,7 @@ def main(
                 console.print()
                 console.print(scorecard)
             if safety_scorecard_file:
-                scorecard_path = Path(safety_scorecard_file)
-                scorecard_path.parent.mkdir(parents=True, exist_ok=True)
-                scorecard_path.write_text(scorecard + "\n", encoding="utf-8")
+                scorecard_path = _write_text_artifact(safety_scorecard_file, scorecard)
                 console.print(f"[dim]Safety scorecard written to: {scorecard_path}[/dim]")
 
         if json_out:
@@ -18,6 +18,10 @@ from agent_polis.governance.policy import load_policy_from_file
 from agent_polis.governance.presets import load_policy_preset
 from agent_polis.governance.prompt_scanner import PromptInjectionScanner
 
+from safe_agent.risk import risk_severity
+
+_WHITESPACE_RE = re.compile(r"\s")
+
 
 class DiffGateRunner:
     """Analyze Git diff changes with impact-preview, without LLM planning."""
@@ -65,25 +69,15 @@ class DiffGateRunner:
             raise ValueError("diff_ref cannot start with '-'.")
         if "\x00" in ref:
             raise ValueError("diff_ref contains invalid characters.")
-        if re.search(r"\s", ref):
+        if _WHITESPACE_RE.search(ref):
             raise ValueError("diff_ref cannot contain whitespace.")
         return ref
 
-    @staticmethod
-    def _risk_severity(level: RiskLevel) -> int:
-        order = {
-            RiskLevel.LOW: 0,
-            RiskLevel.MEDIUM: 1,
-            RiskLevel.HIGH: 2,
-            RiskLevel.CRITICAL: 3,
-        }
-        return order.get(level, 99)
-
     def _note_risk(self, level: RiskLevel) -> None:
         if self.max_risk_level_seen is None:
             self.max_risk_level_seen = level
             return
-        if self._risk_severity(level) > self._risk_severity(self.max_risk_level_seen):
+        if risk_severity(level) > risk_severity(self.max_risk_level_seen):
             self.max_risk_level_seen = level
 
     def _resolve_path_safe(self, path: str) -> Path | None:
@@ -320,7 +314,7 @@ class DiffGateRunner:
             resolved_path = self._resolve_path_safe(path)
             if resolved_path is None:
                 self._note_risk(RiskLevel.CRITICAL)
-                if self.fail_on_risk and self._risk_severity(RiskLevel.CRITICAL) >= self._risk_severity(
+                if self.fail_on_risk and risk_severity(RiskLevel.CRITICAL) >= risk_severity(
                     self.fail_on_risk
                 ):
                     self.risk_policy_failed = True
@@ -399,7 +393,7 @@ class DiffGateRunner:
                 )
                 continue
 
-            if self.fail_on_risk and self._risk_severity(preview.risk_level) >= self._risk_severity(self.fail_on_risk):
+            if self.fail_on_risk and risk_severity(preview.risk_level) >= risk_severity(self.fail_on_risk):
                 self.risk_policy_failed = True
                 self.changes_rejected.append(change)
                 self._record_governance_event(
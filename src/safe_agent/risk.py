@@ -0,0 +1,18 @@
+"""Risk level ordering shared by SafeAgent and the diff gate."""
+
+from __future__ import annotations
+
+from agent_polis.actions.models import RiskLevel
+
+# RiskLevel is a str enum, so ordering comparisons go through this table.
+RISK_SEVERITY = {
+    RiskLevel.LOW: 0,
+    RiskLevel.MEDIUM: 1,
+    RiskLevel.HIGH: 2,
+    RiskLevel.CRITICAL: 3,
+}
+
+
+def risk_severity(level: RiskLevel) -> int:
+    """Return the ordering rank of ``level``; unknown levels rank above CRITICAL."""
+    return RISK_SEVERITY.get(level, 99)
@@ -2,12 +2,42 @@
 
 from __future__ import annotations
 
+import os
+import tomllib
+from collections.abc import Callable, Iterator
 from pathlib import Path
+from typing import Any
 
+# Import the governance modules SafeAgent loads lazily so the first test that
+# builds an agent does not absorb the one-off import cost.
+import agent_polis.governance.policy
+import agent_polis.governance.presets
+import agent_polis.governance.prompt_scanner  # noqa: F401
 import pytest
+from helpers import async_return
 
 from safe_agent.agent import SafeAgent
 
+_ROOT = Path(__file__).resolve().parents[1]
+_PYPROJECT_PATH = _ROOT / "pyproject.toml"
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _anthropic_key() -> Iterator[None]:
+    """Provide a placeholder API key for the session so the CLI's pre-flight key check passes."""
+    previous = os.environ.get("ANTHROPIC_API_KEY")
+    os.environ.setdefault("ANTHROPIC_API_KEY", "test-key")
+    yield
+    if previous is None:
+        os.environ.pop("ANTHROPIC_API_KEY", None)
+
+
+@pytest.fixture(scope="session")
+def pyproject_data() -> dict[str, Any]:
+    """Parsed project pyproject.toml, read once per session."""
+    with _PYPROJECT_PATH.open("rb") as f:
+        return tomllib.load(f)
+
 
 @pytest.fixture
 def temp_work_dir(tmp_path: Path) -> Path:
@@ -16,7 +46,55 @@ def temp_work_dir(tmp_path: Path) -> Path:
 
 
 @pytest.fixture
-def safe_agent(temp_work_dir: Path, monkeypatch: pytest.MonkeyPatch) -> SafeAgent:
+def safe_agent(temp_work_dir: Path) -> SafeAgent:
     """SafeAgent instance configured for offline tests."""
-    monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
     return SafeAgent(working_directory=str(temp_work_dir), non_interactive=True, dry_run=False)
+
+
+@pytest.fixture
+def compliance_agent(temp_work_dir: Path) -> tuple[SafeAgent, Path]:
+    """Non-interactive SafeAgent exporting its audit trail; returns ``(agent, export_path)``."""
+    export_path = temp_work_dir / "audit.json"
+    agent = SafeAgent(
+        working_directory=str(temp_work_dir),
+        non_interactive=True,
+        audit_export_path=str(export_path),
+    )
+    return agent, export_path
+
+
+@pytest.fixture
+def empty_plan(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Make every SafeAgent plan no file changes for the duration of one test."""
+    monkeypatch.setattr(
+        SafeAgent, "_plan_changes", async_return({"summary": "Nothing to do", "changes": []})
+    )
+
+
+@pytest.fixture
+def make_plan(monkeypatch: pytest.MonkeyPatch) -> Callable[..., None]:
+    """
+    Stub an agent's planner and analyzer for one test.
+
+    ``make_plan(agent, changes, previews=[...])`` makes ``_plan_changes`` return the
+    given changes and ``analyzer.analyze`` return each preview in turn.
+    """
+
+    def _make_plan(
+        agent: SafeAgent,
+        changes: list[dict[str, Any]] | None = None,
+        *,
+        previews: list[Any] | None = None,
+        summary: str = "Test",
+    ) -> None:
+        plan = {"summary": summary, "changes": changes or []}
+        monkeypatch.setattr(agent, "_plan_changes", async_return(plan))
+        if previews:
+            remaining = iter(previews)
+
+            async def _analyze(request: Any) -> Any:
+                return next(remaining)
+
+            monkeypatch.setattr(agent.analyzer, "analyze", _analyze)
+
+    return _make_plan
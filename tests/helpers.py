@@ -0,0 +1,37 @@
+"""Shared test helpers for safe-agent; fixtures live in conftest.py."""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Awaitable, Callable
+from types import MappingProxyType, SimpleNamespace
+from typing import Any
+
+from agent_polis.actions.models import RiskLevel
+
+try:
+    import orjson
+
+    json_loads = orjson.loads
+except ModuleNotFoundError:
+    json_loads = json.loads
+
+# One shared read-only preview per risk level; empty tuples so nothing mutable is shared.
+PREVIEWS = {
+    level: SimpleNamespace(risk_level=level, risk_factors=(), file_changes=())
+    for level in RiskLevel
+}
+
+# Shared read-only change payload; _preview_and_approve only reads from it.
+ACTION = MappingProxyType(
+    {"action": "modify", "path": "foo.py", "description": "x", "content": "x"}
+)
+
+
+def async_return(value: Any) -> Callable[..., Awaitable[Any]]:
+    """Build a coroutine function that ignores its arguments and returns ``value``."""
+
+    async def _return(*args: Any, **kwargs: Any) -> Any:
+        return value
+
+    return _return
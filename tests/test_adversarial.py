@@ -49,3 +49,37 @@ def test_adversarial_suite_report_fails_when_expectation_mismatch(tmp_path: Path
 
     assert report["all_passed"] is False
     assert report["failed_cases"] == 1
+
+
+def test_adversarial_suite_keeps_case_order(tmp_path: Path) -> None:
+    risks = ["low", "critical", "medium", "high"] * 3
+    cases = []
+    for index, risk in enumerate(risks):
+        approved = risk in {"low", "medium"}
+        outcome = (
+            "approved_non_interactive" if approved else "blocked_non_interactive_requires_approval"
+        )
+        cases.append(
+            {
+                "id": f"case-{index}",
+                "risk_level": risk,
+                "change": {
+                    "action": "modify",
+                    "path": f"src/example_{index}.py",
+                    "description": "example",
+                    "content": "print('ok')\n",
+                },
+                "agent": {"non_interactive": True, "dry_run": False},
+                "expected": {"outcome": outcome, "approved": approved},
+            }
+        )
+    suite = tmp_path / "suite.json"
+    suite.write_text(json.dumps({"cases": cases}), encoding="utf-8")
+
+    report = run_adversarial_suite_from_file(suite, workdir=str(tmp_path))
+
+    assert [item["id"] for item in report["results"]] == [case["id"] for case in cases]
+    assert report["total_cases"] == len(cases)
+    assert report["all_passed"] is True
+    approved = [item["approved"] for item in report["results"]]
+    assert approved == [risk in {"low", "medium"} for risk in risks]
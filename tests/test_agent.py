@@ -1,7 +1,6 @@
 """Tests for SafeAgent core logic."""
 
 from pathlib import Path
-from unittest.mock import AsyncMock, patch
 
 import pytest
 
@@ -10,6 +9,8 @@ try:
 except ModuleNotFoundError:
     from impact_preview.actions.models import RiskLevel
 
+from helpers import ACTION, PREVIEWS, async_return
+
 from safe_agent.agent import SafeAgent
 
 
@@ -50,13 +51,10 @@ class TestResolvePathSafe:
 class TestRunReturnShape:
     """Tests for consistent return shape from run()."""
 
-    @pytest.mark.asyncio
     async def test_returns_changes_made_and_rejected_when_no_plan_changes(
-        self, safe_agent: SafeAgent
+        self, safe_agent: SafeAgent, empty_plan: None
     ) -> None:
-        with patch.object(safe_agent, "_plan_changes", new_callable=AsyncMock) as mock_plan:
-            mock_plan.return_value = {"summary": "Nothing to do", "changes": []}
-            result = await safe_agent.run("do nothing")
+        result = await safe_agent.run("do nothing")
         assert "changes_made" in result
         assert "changes_rejected" in result
         assert result["changes_made"] == []
@@ -67,43 +65,25 @@ class TestRunReturnShape:
 class TestNonInteractive:
     """Tests for non-interactive approval behaviour (no TTY)."""
 
-    @pytest.mark.asyncio
-    async def test_non_interactive_approves_low_and_medium(
-        self, safe_agent: SafeAgent, temp_work_dir: Path
-    ) -> None:
-        safe_agent.non_interactive = True
-        safe_agent.dry_run = False
-        for level in (RiskLevel.LOW, RiskLevel.MEDIUM):
-            with patch.object(
-                safe_agent.analyzer,
-                "analyze",
-                new_callable=AsyncMock,
-                return_value=_mock_preview(level),
-            ):
-                approved = await safe_agent._preview_and_approve(
-                    {"action": "modify", "path": "foo.py", "description": "x", "content": "x"}
-                )
-            assert approved is True
-
-    @pytest.mark.asyncio
-    async def test_non_interactive_rejects_high_and_critical(
-        self, safe_agent: SafeAgent, temp_work_dir: Path
+    @pytest.mark.parametrize(
+        ("level", "expected"),
+        [
+            (RiskLevel.LOW, True),
+            (RiskLevel.MEDIUM, True),
+            (RiskLevel.HIGH, False),
+            (RiskLevel.CRITICAL, False),
+        ],
+    )
+    async def test_non_interactive_approval_by_risk_level(
+        self,
+        safe_agent: SafeAgent,
+        level: RiskLevel,
+        expected: bool,
     ) -> None:
         safe_agent.non_interactive = True
         safe_agent.dry_run = False
-        for level in (RiskLevel.HIGH, RiskLevel.CRITICAL):
-            with patch.object(
-                safe_agent.analyzer,
-                "analyze",
-                new_callable=AsyncMock,
-                return_value=_mock_preview(level),
-            ):
-                approved = await safe_agent._preview_and_approve(
-                    {"action": "modify", "path": "foo.py", "description": "x", "content": "x"}
-                )
-            assert approved is False
-
-
-def _mock_preview(risk_level: RiskLevel) -> object:
-    """Minimal preview object for testing."""
-    return type("Preview", (), {"risk_level": risk_level, "risk_factors": [], "file_changes": []})()
+        safe_agent.analyzer.analyze = async_return(PREVIEWS[level])
+
+        approved = await safe_agent._preview_and_approve(ACTION)
+
+        assert approved is expected
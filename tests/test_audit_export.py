@@ -2,9 +2,9 @@
 
 from __future__ import annotations
 
-import json
+from collections.abc import AsyncIterator
 from pathlib import Path
-from unittest.mock import AsyncMock, Mock, patch
+from types import SimpleNamespace
 
 import pytest
 
@@ -13,47 +13,50 @@ try:
 except ModuleNotFoundError:
     from impact_preview.actions.models import RiskLevel
 
+from helpers import PREVIEWS, async_return, json_loads
+
 from safe_agent.agent import SafeAgent
 
 
-def _mock_preview(
-    risk_level: RiskLevel,
-    risk_factors: list[str] | None = None,
-    file_changes: list | None = None,
-) -> Mock:
-    """Create a mock preview object for testing."""
-    return Mock(
-        risk_level=risk_level,
-        risk_factors=risk_factors or [],
-        file_changes=file_changes or [],
+def _read_audit(path: Path) -> dict:
+    """Load an exported audit, transparently handling zstd-compressed output."""
+    data = path.read_bytes()
+    if path.suffix == ".zst":
+        import zstandard
+
+        data = zstandard.ZstdDecompressor().decompress(data)
+    return json_loads(data)
+
+
+@pytest.fixture(scope="class")
+async def exported_audit(
+    tmp_path_factory: pytest.TempPathFactory,
+) -> AsyncIterator[tuple[dict, Path]]:
+    """Run one compliance-mode no-op task and share its parsed export."""
+    work_dir = tmp_path_factory.mktemp("audit-format").resolve()
+    export_path = work_dir / "audit.json"
+
+    agent = SafeAgent(
+        working_directory=str(work_dir),
+        non_interactive=True,
+        audit_export_path=str(export_path),
+        compliance_mode=True,
     )
+    agent._plan_changes = async_return({"summary": "Nothing", "changes": []})
+    await agent.run("refactor the auth module")
+
+    assert export_path.exists()
+    yield _read_audit(export_path), work_dir
 
 
 class TestAuditExportJSONFormat:
     """Tests for audit export JSON format validation."""
 
-    @pytest.mark.asyncio
-    async def test_audit_export_has_required_top_level_keys(
-        self, temp_work_dir: Path, monkeypatch: pytest.MonkeyPatch
+    def test_audit_export_has_required_top_level_keys(
+        self, exported_audit: tuple[dict, Path]
     ) -> None:
         """Audit export JSON contains all required top-level keys."""
-        monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
-        export_path = temp_work_dir / "audit.json"
-
-        agent = SafeAgent(
-            working_directory=str(temp_work_dir),
-            non_interactive=True,
-            audit_export_path=str(export_path),
-        )
-
-        # Mock _plan_changes to return no changes
-        with patch.object(agent, "_plan_changes", new_callable=AsyncMock) as mock_plan:
-            mock_plan.return_value = {"summary": "Nothing to do", "changes": []}
-            await agent.run("test task")
-
-        assert export_path.exists()
-        with open(export_path) as f:
-            audit_data = json.load(f)
+        audit_data, _ = exported_audit
 
         # Required top-level keys per insurance-integration.md spec
         assert "audit_metadata" in audit_data
@@ -61,27 +64,9 @@ class TestAuditExportJSONFormat:
         assert "changes" in audit_data
         assert "summary" in audit_data
 
-    @pytest.mark.asyncio
-    async def test_audit_metadata_has_required_fields(
-        self, temp_work_dir: Path, monkeypatch: pytest.MonkeyPatch
-    ) -> None:
+    def test_audit_metadata_has_required_fields(self, exported_audit: tuple[dict, Path]) -> None:
         """Audit metadata contains all required fields."""
-        monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
-        export_path = temp_work_dir / "audit.json"
-
-        agent = SafeAgent(
-            working_directory=str(temp_work_dir),
-            non_interactive=True,
-            audit_export_path=str(export_path),
-            compliance_mode=True,
-        )
-
-        with patch.object(agent, "_plan_changes", new_callable=AsyncMock) as mock_plan:
-            mock_plan.return_value = {"summary": "Nothing", "changes": []}
-            await agent.run("test task")
-
-        with open(export_path) as f:
-            audit_data = json.load(f)
+        audit_data, _ = exported_audit
 
         metadata = audit_data["audit_metadata"]
         assert "export_version" in metadata
@@ -92,26 +77,9 @@ class TestAuditExportJSONFormat:
         assert metadata["compliance_mode"] is True
         assert "export_timestamp" in metadata
 
-    @pytest.mark.asyncio
-    async def test_task_metadata_has_required_fields(
-        self, temp_work_dir: Path, monkeypatch: pytest.MonkeyPatch
-    ) -> None:
+    def test_task_metadata_has_required_fields(self, exported_audit: tuple[dict, Path]) -> None:
         """Task metadata contains all required fields."""
-        monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
-        export_path = temp_work_dir / "audit.json"
-
-        agent = SafeAgent(
-            working_directory=str(temp_work_dir),
-            non_interactive=True,
-            audit_export_path=str(export_path),
-        )
-
-        with patch.object(agent, "_plan_changes", new_callable=AsyncMock) as mock_plan:
-            mock_plan.return_value = {"summary": "Nothing", "changes": []}
-            await agent.run("refactor the auth module")
-
-        with open(export_path) as f:
-            audit_data = json.load(f)
+        audit_data, work_dir = exported_audit
 
         task = audit_data["task"]
         assert "task_description" in task
@@ -119,29 +87,12 @@ class TestAuditExportJSONFormat:
         assert "requested_at" in task
         assert "requested_by" in task
         assert "working_directory" in task
-        assert task["working_directory"] == str(temp_work_dir)
+        assert task["working_directory"] == str(work_dir)
         assert "model_used" in task
 
-    @pytest.mark.asyncio
-    async def test_summary_has_required_fields(
-        self, temp_work_dir: Path, monkeypatch: pytest.MonkeyPatch
-    ) -> None:
+    def test_summary_has_required_fields(self, exported_audit: tuple[dict, Path]) -> None:
         """Summary contains all required fields."""
-        monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
-        export_path = temp_work_dir / "audit.json"
-
-        agent = SafeAgent(
-            working_directory=str(temp_work_dir),
-            non_interactive=True,
-            audit_export_path=str(export_path),
-        )
-
-        with patch.object(agent, "_plan_changes", new_callable=AsyncMock) as mock_plan:
-            mock_plan.return_value = {"summary": "Nothing", "changes": []}
-            await agent.run("test task")
-
-        with open(export_path) as f:
-            audit_data = json.load(f)
+        audit_data, _ = exported_audit
 
         summary = audit_data["summary"]
         assert "total_changes_planned" in summary
@@ -152,26 +103,9 @@ class TestAuditExportJSONFormat:
         assert "policy_violations" in summary
         assert "duration_seconds" in summary
 
-    @pytest.mark.asyncio
-    async def test_compliance_flags_present(
-        self, temp_work_dir: Path, monkeypatch: pytest.MonkeyPatch
-    ) -> None:
+    def test_compliance_flags_present(self, exported_audit: tuple[dict, Path]) -> None:
         """Compliance flags section is present with required fields."""
-        monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
-        export_path = temp_work_dir / "audit.json"
-
-        agent = SafeAgent(
-            working_directory=str(temp_work_dir),
-            non_interactive=True,
-            audit_export_path=str(export_path),
-        )
-
-        with patch.object(agent, "_plan_changes", new_callable=AsyncMock) as mock_plan:
-            mock_plan.return_value = {"summary": "Nothing", "changes": []}
-            await agent.run("test task")
-
-        with open(export_path) as f:
-            audit_data = json.load(f)
+        audit_data, _ = exported_audit
 
         flags = audit_data["compliance_flags"]
         assert "compliance_mode_enabled" in flags
@@ -183,12 +117,8 @@ class TestAuditExportJSONFormat:
 class TestComplianceModeEnforcement:
     """Tests for compliance mode strict settings enforcement."""
 
-    def test_compliance_mode_disables_auto_approve(
-        self, temp_work_dir: Path, monkeypatch: pytest.MonkeyPatch
-    ) -> None:
+    def test_compliance_mode_disables_auto_approve(self, temp_work_dir: Path) -> None:
         """Compliance mode disables auto-approve-low even when requested."""
-        monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
-
         # Try to enable both compliance_mode and auto_approve_low_risk
         agent = SafeAgent(
             working_directory=str(temp_work_dir),
@@ -200,12 +130,8 @@ class TestComplianceModeEnforcement:
         assert agent.compliance_mode is True
         assert agent.auto_approve_low_risk is False
 
-    def test_compliance_mode_false_allows_auto_approve(
-        self, temp_work_dir: Path, monkeypatch: pytest.MonkeyPatch
-    ) -> None:
+    def test_compliance_mode_false_allows_auto_approve(self, temp_work_dir: Path) -> None:
         """Without compliance mode, auto-approve can be enabled."""
-        monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
-
         agent = SafeAgent(
             working_directory=str(temp_work_dir),
             auto_approve_low_risk=True,
@@ -215,12 +141,8 @@ class TestComplianceModeEnforcement:
         assert agent.compliance_mode is False
         assert agent.auto_approve_low_risk is True
 
-    def test_compliance_mode_recorded_in_audit_metadata(
-        self, temp_work_dir: Path, monkeypatch: pytest.MonkeyPatch
-    ) -> None:
+    def test_compliance_mode_recorded_in_audit_metadata(self, temp_work_dir: Path) -> None:
         """Compliance mode status is recorded in audit trail metadata."""
-        monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
-
         agent_compliant = SafeAgent(
             working_directory=str(temp_work_dir),
             compliance_mode=True,
@@ -233,12 +155,10 @@ class TestComplianceModeEnforcement:
         )
         assert agent_normal.audit_trail["audit_metadata"]["compliance_mode"] is False
 
-    @pytest.mark.asyncio
     async def test_compliance_mode_recorded_in_export(
-        self, temp_work_dir: Path, monkeypatch: pytest.MonkeyPatch
+        self, temp_work_dir: Path, empty_plan: None
     ) -> None:
         """Compliance mode is correctly recorded in exported audit."""
-        monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
         export_path = temp_work_dir / "audit-compliant.json"
 
         agent = SafeAgent(
@@ -248,12 +168,9 @@ class TestComplianceModeEnforcement:
             compliance_mode=True,
         )
 
-        with patch.object(agent, "_plan_changes", new_callable=AsyncMock) as mock_plan:
-            mock_plan.return_value = {"summary": "Nothing", "changes": []}
-            await agent.run("test task")
+        await agent.run("test task")
 
-        with open(export_path) as f:
-            audit_data = json.load(f)
+        audit_data = _read_audit(export_path)
 
         assert audit_data["audit_metadata"]["compliance_mode"] is True
         assert audit_data["compliance_flags"]["compliance_mode_enabled"] is True
@@ -262,12 +179,8 @@ class TestComplianceModeEnforcement:
 class TestAuditExportNoOpTasks:
     """Tests for audit export when no changes are made."""
 
-    @pytest.mark.asyncio
-    async def test_audit_export_for_noop_task(
-        self, temp_work_dir: Path, monkeypatch: pytest.MonkeyPatch
-    ) -> None:
+    async def test_audit_export_for_noop_task(self, temp_work_dir: Path, empty_plan: None) -> None:
         """Audit is exported even when no changes are planned."""
-        monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
         export_path = temp_work_dir / "audit-noop.json"
 
         agent = SafeAgent(
@@ -276,9 +189,7 @@ class TestAuditExportNoOpTasks:
             audit_export_path=str(export_path),
         )
 
-        with patch.object(agent, "_plan_changes", new_callable=AsyncMock) as mock_plan:
-            mock_plan.return_value = {"summary": "Nothing to do", "changes": []}
-            result = await agent.run("analyze code")
+        result = await agent.run("analyze code")
 
         # Should succeed
         assert result["success"] is True
@@ -287,8 +198,7 @@ class TestAuditExportNoOpTasks:
         # Audit file should exist
         assert export_path.exists()
 
-        with open(export_path) as f:
-            audit_data = json.load(f)
+        audit_data = _read_audit(export_path)
 
         # Should have all required sections
         assert audit_data["task"]["task_description"] == "analyze code"
@@ -297,12 +207,10 @@ class TestAuditExportNoOpTasks:
         assert audit_data["summary"]["changes_rejected"] == 0
         assert audit_data["changes"] == []
 
-    @pytest.mark.asyncio
     async def test_max_risk_level_null_for_noop(
-        self, temp_work_dir: Path, monkeypatch: pytest.MonkeyPatch
+        self, temp_work_dir: Path, empty_plan: None
     ) -> None:
         """Max risk level is null when no changes are analyzed."""
-        monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
         export_path = temp_work_dir / "audit-noop-risk.json"
 
         agent = SafeAgent(
@@ -311,14 +219,11 @@ class TestAuditExportNoOpTasks:
             audit_export_path=str(export_path),
         )
 
-        with patch.object(agent, "_plan_changes", new_callable=AsyncMock) as mock_plan:
-            mock_plan.return_value = {"summary": "Nothing", "changes": []}
-            result = await agent.run("list files")
+        result = await agent.run("list files")
 
         assert result["max_risk_level_seen"] is None
 
-        with open(export_path) as f:
-            audit_data = json.load(f)
+        audit_data = _read_audit(export_path)
 
         assert audit_data["summary"]["max_risk_level_seen"] is None
 
@@ -326,12 +231,8 @@ class TestAuditExportNoOpTasks:
 class TestAuditExportWithApprovedChanges:
     """Tests for audit export when changes are approved and executed."""
 
-    @pytest.mark.asyncio
-    async def test_audit_tracks_approved_changes(
-        self, temp_work_dir: Path, monkeypatch: pytest.MonkeyPatch
-    ) -> None:
+    async def test_audit_tracks_approved_changes(self, temp_work_dir: Path) -> None:
         """Approved changes are tracked in summary."""
-        monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
         export_path = temp_work_dir / "audit-approved.json"
 
         agent = SafeAgent(
@@ -341,35 +242,28 @@ class TestAuditExportWithApprovedChanges:
         )
 
         # Mock plan with one low-risk change
-        with patch.object(agent, "_plan_changes", new_callable=AsyncMock) as mock_plan:
-            mock_plan.return_value = {
-                "summary": "Create test file",
-                "changes": [
-                    {
-                        "action": "create",
-                        "path": "test.py",
-                        "description": "Add test file",
-                        "content": "# test",
-                    }
-                ],
-            }
-
-            # Mock analyzer to return low risk
-            with patch.object(
-                agent.analyzer,
-                "analyze",
-                new_callable=AsyncMock,
-                return_value=_mock_preview(RiskLevel.LOW),
-            ):
-                result = await agent.run("create test file")
+        plan = {
+            "summary": "Create test file",
+            "changes": [
+                {
+                    "action": "create",
+                    "path": "test.py",
+                    "description": "Add test file",
+                    "content": "# test",
+                }
+            ],
+        }
+        # Mock analyzer to return low risk
+        agent._plan_changes = async_return(plan)
+        agent.analyzer.analyze = async_return(PREVIEWS[RiskLevel.LOW])
+        result = await agent.run("create test file")
 
         # Non-interactive mode auto-approves low risk
         assert result["success"] is True
         assert len(result["changes_made"]) == 1
         assert len(result["changes_rejected"]) == 0
 
-        with open(export_path) as f:
-            audit_data = json.load(f)
+        audit_data = _read_audit(export_path)
 
         assert audit_data["summary"]["total_changes_planned"] == 1
         assert audit_data["summary"]["changes_approved"] == 1
@@ -377,12 +271,8 @@ class TestAuditExportWithApprovedChanges:
         assert audit_data["summary"]["changes_executed"] == 1
         assert audit_data["summary"]["max_risk_level_seen"] == "low"
 
-    @pytest.mark.asyncio
-    async def test_max_risk_level_tracks_highest(
-        self, temp_work_dir: Path, monkeypatch: pytest.MonkeyPatch
-    ) -> None:
+    async def test_max_risk_level_tracks_highest(self, temp_work_dir: Path) -> None:
         """Max risk level tracks the highest risk seen across all changes."""
-        monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
         export_path = temp_work_dir / "audit-max-risk.json"
 
         agent = SafeAgent(
@@ -391,46 +281,40 @@ class TestAuditExportWithApprovedChanges:
             audit_export_path=str(export_path),
         )
 
-        with patch.object(agent, "_plan_changes", new_callable=AsyncMock) as mock_plan:
-            mock_plan.return_value = {
-                "summary": "Multiple changes",
-                "changes": [
-                    {
-                        "action": "create",
-                        "path": "low.py",
-                        "description": "Low risk",
-                        "content": "x",
-                    },
-                    {
-                        "action": "modify",
-                        "path": "medium.py",
-                        "description": "Medium risk",
-                        "content": "y",
-                    },
-                ],
-            }
-
-            # Mock analyzer to return different risk levels
-            call_count = 0
-            async def mock_analyze(*args, **kwargs):
-                nonlocal call_count
-                call_count += 1
-                if call_count == 1:
-                    return _mock_preview(RiskLevel.LOW)
-                else:
-                    return _mock_preview(RiskLevel.MEDIUM)
-
-            with patch.object(
-                agent.analyzer,
-                "analyze",
-                side_effect=mock_analyze,
-            ):
-                result = await agent.run("multiple changes")
+        plan = {
+            "summary": "Multiple changes",
+            "changes": [
+                {
+                    "action": "create",
+                    "path": "low.py",
+                    "description": "Low risk",
+                    "content": "x",
+                },
+                {
+                    "action": "modify",
+                    "path": "medium.py",
+                    "description": "Medium risk",
+                    "content": "y",
+                },
+            ],
+        }
+        agent._plan_changes = async_return(plan)
+        # Mock analyzer to return different risk levels
+        call_count = 0
+        async def mock_analyze(*args, **kwargs):
+            nonlocal call_count
+            call_count += 1
+            if call_count == 1:
+                return PREVIEWS[RiskLevel.LOW]
+            else:
+                return PREVIEWS[RiskLevel.MEDIUM]
+
+        agent.analyzer.analyze = mock_analyze
+        result = await agent.run("multiple changes")
 
         assert result["max_risk_level_seen"] == "medium"
 
-        with open(export_path) as f:
-            audit_data = json.load(f)
+        audit_data = _read_audit(export_path)
 
         assert audit_data["summary"]["max_risk_level_seen"] == "medium"
 
@@ -438,12 +322,8 @@ class TestAuditExportWithApprovedChanges:
 class TestAuditExportWithRejectedChanges:
     """Tests for audit export when changes are rejected."""
 
-    @pytest.mark.asyncio
-    async def test_audit_tracks_rejected_changes(
-        self, temp_work_dir: Path, monkeypatch: pytest.MonkeyPatch
-    ) -> None:
+    async def test_audit_tracks_rejected_changes(self, temp_work_dir: Path) -> None:
         """Rejected changes are tracked separately from approved."""
-        monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
         export_path = temp_work_dir / "audit-rejected.json"
 
         agent = SafeAgent(
@@ -452,45 +332,34 @@ class TestAuditExportWithRejectedChanges:
             audit_export_path=str(export_path),
         )
 
-        with patch.object(agent, "_plan_changes", new_callable=AsyncMock) as mock_plan:
-            mock_plan.return_value = {
-                "summary": "Risky change",
-                "changes": [
-                    {
-                        "action": "delete",
-                        "path": "important.py",
-                        "description": "Delete important file",
-                    }
-                ],
-            }
-
-            # Non-interactive mode rejects HIGH risk
-            with patch.object(
-                agent.analyzer,
-                "analyze",
-                new_callable=AsyncMock,
-                return_value=_mock_preview(RiskLevel.HIGH),
-            ):
-                result = await agent.run("delete files")
+        plan = {
+            "summary": "Risky change",
+            "changes": [
+                {
+                    "action": "delete",
+                    "path": "important.py",
+                    "description": "Delete important file",
+                }
+            ],
+        }
+        # Non-interactive mode rejects HIGH risk
+        agent._plan_changes = async_return(plan)
+        agent.analyzer.analyze = async_return(PREVIEWS[RiskLevel.HIGH])
+        result = await agent.run("delete files")
 
         assert result["success"] is True
         assert len(result["changes_made"]) == 0
         assert len(result["changes_rejected"]) == 1
 
-        with open(export_path) as f:
-            audit_data = json.load(f)
+        audit_data = _read_audit(export_path)
 
         assert audit_data["summary"]["total_changes_planned"] == 1
         assert audit_data["summary"]["changes_approved"] == 0
         assert audit_data["summary"]["changes_rejected"] == 1
         assert audit_data["summary"]["changes_executed"] == 0
 
-    @pytest.mark.asyncio
-    async def test_mixed_approved_and_rejected(
-        self, temp_work_dir: Path, monkeypatch: pytest.MonkeyPatch
-    ) -> None:
+    async def test_mixed_approved_and_rejected(self, temp_work_dir: Path) -> None:
         """Audit correctly counts mix of approved and rejected changes."""
-        monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
         export_path = temp_work_dir / "audit-mixed.json"
 
         agent = SafeAgent(
@@ -499,45 +368,39 @@ class TestAuditExportWithRejectedChanges:
             audit_export_path=str(export_path),
         )
 
-        with patch.object(agent, "_plan_changes", new_callable=AsyncMock) as mock_plan:
-            mock_plan.return_value = {
-                "summary": "Mixed changes",
-                "changes": [
-                    {
-                        "action": "create",
-                        "path": "safe.py",
-                        "description": "Safe change",
-                        "content": "safe",
-                    },
-                    {
-                        "action": "delete",
-                        "path": "risky.py",
-                        "description": "Risky change",
-                    },
-                ],
-            }
-
-            call_count = 0
-            async def mock_analyze(*args, **kwargs):
-                nonlocal call_count
-                call_count += 1
-                if call_count == 1:
-                    return _mock_preview(RiskLevel.LOW)
-                else:
-                    return _mock_preview(RiskLevel.CRITICAL)
-
-            with patch.object(
-                agent.analyzer,
-                "analyze",
-                side_effect=mock_analyze,
-            ):
-                result = await agent.run("mixed changes")
+        plan = {
+            "summary": "Mixed changes",
+            "changes": [
+                {
+                    "action": "create",
+                    "path": "safe.py",
+                    "description": "Safe change",
+                    "content": "safe",
+                },
+                {
+                    "action": "delete",
+                    "path": "risky.py",
+                    "description": "Risky change",
+                },
+            ],
+        }
+        agent._plan_changes = async_return(plan)
+        call_count = 0
+        async def mock_analyze(*args, **kwargs):
+            nonlocal call_count
+            call_count += 1
+            if call_count == 1:
+                return PREVIEWS[RiskLevel.LOW]
+            else:
+                return PREVIEWS[RiskLevel.CRITICAL]
+
+        agent.analyzer.analyze = mock_analyze
+        result = await agent.run("mixed changes")
 
         assert len(result["changes_made"]) == 1
         assert len(result["changes_rejected"]) == 1
 
-        with open(export_path) as f:
-            audit_data = json.load(f)
+        audit_data = _read_audit(export_path)
 
         assert audit_data["summary"]["total_changes_planned"] == 2
         assert audit_data["summary"]["changes_approved"] == 1
@@ -547,12 +410,8 @@ class TestAuditExportWithRejectedChanges:
 class TestAuditExportDryRun:
     """Tests for audit export in dry-run mode."""
 
-    @pytest.mark.asyncio
-    async def test_dry_run_changes_executed_is_zero(
-        self, temp_work_dir: Path, monkeypatch: pytest.MonkeyPatch
-    ) -> None:
+    async def test_dry_run_changes_executed_is_zero(self, temp_work_dir: Path) -> None:
         """Dry run mode reports zero changes executed."""
-        monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
         export_path = temp_work_dir / "audit-dry-run.json"
 
         agent = SafeAgent(
@@ -562,26 +421,20 @@ class TestAuditExportDryRun:
             audit_export_path=str(export_path),
         )
 
-        with patch.object(agent, "_plan_changes", new_callable=AsyncMock) as mock_plan:
-            mock_plan.return_value = {
-                "summary": "Test change",
-                "changes": [
-                    {
-                        "action": "create",
-                        "path": "test.py",
-                        "description": "Test",
-                        "content": "test",
-                    }
-                ],
-            }
-
-            with patch.object(
-                agent.analyzer,
-                "analyze",
-                new_callable=AsyncMock,
-                return_value=_mock_preview(RiskLevel.LOW),
-            ):
-                result = await agent.run("test task")
+        plan = {
+            "summary": "Test change",
+            "changes": [
+                {
+                    "action": "create",
+                    "path": "test.py",
+                    "description": "Test",
+                    "content": "test",
+                }
+            ],
+        }
+        agent._plan_changes = async_return(plan)
+        agent.analyzer.analyze = async_return(PREVIEWS[RiskLevel.LOW])
+        result = await agent.run("test task")
 
         # In dry-run mode, _preview_and_approve returns False (line 390-392)
         # So changes are neither approved nor executed
@@ -589,8 +442,7 @@ class TestAuditExportDryRun:
         # In this case they're marked as rejected
         assert len(result["changes_rejected"]) == 1
 
-        with open(export_path) as f:
-            audit_data = json.load(f)
+        audit_data = _read_audit(export_path)
 
         # Total planned = approved + rejected
         assert audit_data["summary"]["total_changes_planned"] == 1
@@ -602,13 +454,10 @@ class TestAuditExportDryRun:
 class TestAuditExportErrorHandling:
     """Tests for error handling during audit export."""
 
-    @pytest.mark.asyncio
     async def test_invalid_export_path_warns_but_continues(
-        self, temp_work_dir: Path, monkeypatch: pytest.MonkeyPatch, capsys
+        self, temp_work_dir: Path, capsys, empty_plan: None
     ) -> None:
         """Invalid export path logs warning but doesn't crash."""
-        monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
-
         # Use invalid path (non-existent directory)
         invalid_path = "/nonexistent/directory/audit.json"
 
@@ -618,9 +467,7 @@ class TestAuditExportErrorHandling:
             audit_export_path=invalid_path,
         )
 
-        with patch.object(agent, "_plan_changes", new_callable=AsyncMock) as mock_plan:
-            mock_plan.return_value = {"summary": "Nothing", "changes": []}
-            result = await agent.run("test task")
+        result = await agent.run("test task")
 
         # Should succeed despite export failure
         assert result["success"] is True
@@ -628,22 +475,17 @@ class TestAuditExportErrorHandling:
         # Export file should not exist
         assert not Path(invalid_path).exists()
 
-    @pytest.mark.asyncio
     async def test_no_export_path_no_file_created(
-        self, temp_work_dir: Path, monkeypatch: pytest.MonkeyPatch
+        self, temp_work_dir: Path, empty_plan: None
     ) -> None:
         """When no export path is specified, no file is created."""
-        monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
-
         agent = SafeAgent(
             working_directory=str(temp_work_dir),
             non_interactive=True,
             audit_export_path=None,  # No export
         )
 
-        with patch.object(agent, "_plan_changes", new_callable=AsyncMock) as mock_plan:
-            mock_plan.return_value = {"summary": "Nothing", "changes": []}
-            result = await agent.run("test task")
+        result = await agent.run("test task")
 
         assert result["success"] is True
 
@@ -651,44 +493,48 @@ class TestAuditExportErrorHandling:
         audit_files = list(temp_work_dir.glob("*.json"))
         assert len(audit_files) == 0
 
-    @pytest.mark.asyncio
     async def test_export_can_be_called_manually(
-        self, temp_work_dir: Path, monkeypatch: pytest.MonkeyPatch
+        self, temp_work_dir: Path, empty_plan: None
     ) -> None:
         """Audit can be exported manually to different path."""
-        monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
-
         agent = SafeAgent(
             working_directory=str(temp_work_dir),
             non_interactive=True,
             audit_export_path=None,  # Not set during init
         )
 
-        with patch.object(agent, "_plan_changes", new_callable=AsyncMock) as mock_plan:
-            mock_plan.return_value = {"summary": "Nothing", "changes": []}
-            await agent.run("test task")
+        await agent.run("test task")
 
         # Manually export after run
         manual_path = temp_work_dir / "manual-audit.json"
         agent.export_audit_trail(str(manual_path))
 
         assert manual_path.exists()
-        with open(manual_path) as f:
-            audit_data = json.load(f)
+        audit_data = _read_audit(manual_path)
 
         assert "task" in audit_data
         assert audit_data["task"]["task_description"] == "test task"
 
+    async def test_build_audit_export_returns_independent_copy(
+        self, temp_work_dir: Path, empty_plan: None
+    ) -> None:
+        """Mutating the built export does not corrupt the agent's audit trail."""
+        agent = SafeAgent(working_directory=str(temp_work_dir), non_interactive=True)
+        await agent.run("test task")
+
+        audit_data = agent.build_audit_export()
+        audit_data["task"]["task_description"] = "tampered"
+        audit_data["changes"].append({"path": "injected.py"})
+
+        assert agent.audit_trail["task"]["task_description"] == "test task"
+        assert agent.audit_trail["changes"] == []
+
 
 class TestAuditExportIntegration:
     """Integration tests for complete workflow with audit export."""
 
-    @pytest.mark.asyncio
-    async def test_complete_workflow_with_audit(
-        self, temp_work_dir: Path, monkeypatch: pytest.MonkeyPatch
-    ) -> None:
+    async def test_complete_workflow_with_audit(self, temp_work_dir: Path) -> None:
         """Complete workflow from plan to execution produces valid audit."""
-        monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
         export_path = temp_work_dir / "audit-complete.json"
 
         agent = SafeAgent(
@@ -698,43 +544,43 @@ class TestAuditExportIntegration:
         )
 
         # Simulate realistic workflow
-        with patch.object(agent, "_plan_changes", new_callable=AsyncMock) as mock_plan:
-            mock_plan.return_value = {
-                "summary": "Refactor authentication",
-                "changes": [
-                    {
-                        "action": "create",
-                        "path": "auth/jwt.py",
-                        "description": "Add JWT auth",
-                        "content": "import jwt\n\ndef verify_token(token):\n    pass",
-                    },
-                    {
-                        "action": "modify",
-                        "path": "config/settings.py",
-                        "description": "Update settings",
-                        "content": "JWT_SECRET = 'secret'",
-                    },
-                ],
-            }
-
-            call_count = 0
-            async def mock_analyze(*args, **kwargs):
-                nonlocal call_count
-                call_count += 1
-                if call_count == 1:
-                    return _mock_preview(RiskLevel.LOW, risk_factors=["New file creation"])
-                else:
-                    return _mock_preview(
-                        RiskLevel.MEDIUM,
-                        risk_factors=["Configuration change", "Credential pattern"],
-                    )
-
-            with patch.object(
-                agent.analyzer,
-                "analyze",
-                side_effect=mock_analyze,
-            ):
-                result = await agent.run("refactor auth to use JWT")
+        plan = {
+            "summary": "Refactor authentication",
+            "changes": [
+                {
+                    "action": "create",
+                    "path": "auth/jwt.py",
+                    "description": "Add JWT auth",
+                    "content": "import jwt\n\ndef verify_token(token):\n    pass",
+                },
+                {
+                    "action": "modify",
+                    "path": "config/settings.py",
+                    "description": "Update settings",
+                    "content": "JWT_SECRET = 'secret'",
+                },
+            ],
+        }
+        agent._plan_changes = async_return(plan)
+        call_count = 0
+        async def mock_analyze(*args, **kwargs):
+            nonlocal call_count
+            call_count += 1
+            if call_count == 1:
+                return SimpleNamespace(
+                    risk_level=RiskLevel.LOW,
+                    risk_factors=("New file creation",),
+                    file_changes=(),
+                )
+            else:
+                return SimpleNamespace(
+                    risk_level=RiskLevel.MEDIUM,
+                    risk_factors=("Configuration change", "Credential pattern"),
+                    file_changes=(),
+                )
+
+        agent.analyzer.analyze = mock_analyze
+        result = await agent.run("refactor auth to use JWT")
 
         # Verify result
         assert result["success"] is True
@@ -743,8 +589,7 @@ class TestAuditExportIntegration:
 
         # Verify audit export
         assert export_path.exists()
-        with open(export_path) as f:
-            audit_data = json.load(f)
+        audit_data = _read_audit(export_path)
 
         # Verify all sections are complete
         assert audit_data["task"]["task_description"] == "refactor auth to use JWT"
@@ -759,12 +604,8 @@ class TestAuditExportIntegration:
         assert (temp_work_dir / "auth" / "jwt.py").exists()
         assert (temp_work_dir / "config" / "settings.py").exists()
 
-    @pytest.mark.asyncio
-    async def test_audit_duration_is_positive(
-        self, temp_work_dir: Path, monkeypatch: pytest.MonkeyPatch
-    ) -> None:
+    async def test_audit_duration_is_positive(self, temp_work_dir: Path, empty_plan: None) -> None:
         """Audit duration is tracked and positive."""
-        monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
         export_path = temp_work_dir / "audit-duration.json"
 
         agent = SafeAgent(
@@ -773,22 +614,17 @@ class TestAuditExportIntegration:
             audit_export_path=str(export_path),
         )
 
-        with patch.object(agent, "_plan_changes", new_callable=AsyncMock) as mock_plan:
-            mock_plan.return_value = {"summary": "Nothing", "changes": []}
-            await agent.run("test task")
+        await agent.run("test task")
 
-        with open(export_path) as f:
-            audit_data = json.load(f)
+        audit_data = _read_audit(export_path)
 
         assert audit_data["summary"]["duration_seconds"] >= 0
         assert isinstance(audit_data["summary"]["duration_seconds"], (int, float))
 
-    @pytest.mark.asyncio
     async def test_audit_timestamps_are_iso_format(
-        self, temp_work_dir: Path, monkeypatch: pytest.MonkeyPatch
+        self, temp_work_dir: Path, empty_plan: None
     ) -> None:
         """All timestamps in audit are in ISO 8601 format."""
-        monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
         export_path = temp_work_dir / "audit-timestamps.json"
 
         agent = SafeAgent(
@@ -797,12 +633,9 @@ class TestAuditExportIntegration:
             audit_export_path=str(export_path),
         )
 
-        with patch.object(agent, "_plan_changes", new_callable=AsyncMock) as mock_plan:
-            mock_plan.return_value = {"summary": "Nothing", "changes": []}
-            await agent.run("test task")
+        await agent.run("test task")
 
-        with open(export_path) as f:
-            audit_data = json.load(f)
+        audit_data = _read_audit(export_path)
 
         # Check timestamp formats
         import datetime
@@ -821,12 +654,10 @@ class TestAuditExportIntegration:
 class TestAuditExportEdgeCases:
     """Tests for edge cases and corner cases."""
 
-    @pytest.mark.asyncio
     async def test_unsafe_path_rejected_does_not_crash_audit(
-        self, temp_work_dir: Path, monkeypatch: pytest.MonkeyPatch
+        self, temp_work_dir: Path
     ) -> None:
         """Unsafe path rejection doesn't break audit export."""
-        monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
         export_path = temp_work_dir / "audit-unsafe.json"
 
         agent = SafeAgent(
@@ -835,36 +666,32 @@ class TestAuditExportEdgeCases:
             audit_export_path=str(export_path),
         )
 
-        with patch.object(agent, "_plan_changes", new_callable=AsyncMock) as mock_plan:
-            mock_plan.return_value = {
-                "summary": "Dangerous operation",
-                "changes": [
-                    {
-                        "action": "delete",
-                        "path": "../../../etc/passwd",  # Unsafe path
-                        "description": "Delete system file",
-                    }
-                ],
-            }
-
-            # This should be rejected by _resolve_path_safe
-            result = await agent.run("delete system files")
+        plan = {
+            "summary": "Dangerous operation",
+            "changes": [
+                {
+                    "action": "delete",
+                    "path": "../../../etc/passwd",  # Unsafe path
+                    "description": "Delete system file",
+                }
+            ],
+        }
+        agent._plan_changes = async_return(plan)
+        # This should be rejected by _resolve_path_safe
+        result = await agent.run("delete system files")
 
         assert result["success"] is True  # Task completes, just rejects unsafe change
         assert export_path.exists()
 
-        with open(export_path) as f:
-            audit_data = json.load(f)
+        audit_data = _read_audit(export_path)
 
         # Should record the rejected change
         assert audit_data["summary"]["changes_rejected"] == 1
 
-    @pytest.mark.asyncio
     async def test_empty_task_description_handled(
-        self, temp_work_dir: Path, monkeypatch: pytest.MonkeyPatch
+        self, temp_work_dir: Path, empty_plan: None
     ) -> None:
         """Empty task description doesn't break audit export."""
-        monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
         export_path = temp_work_dir / "audit-empty-task.json"
 
         agent = SafeAgent(
@@ -873,22 +700,17 @@ class TestAuditExportEdgeCases:
             audit_export_path=str(export_path),
         )
 
-        with patch.object(agent, "_plan_changes", new_callable=AsyncMock) as mock_plan:
-            mock_plan.return_value = {"summary": "Nothing", "changes": []}
-            await agent.run("")  # Empty task
+        await agent.run("")  # Empty task
 
         assert export_path.exists()
-        with open(export_path) as f:
-            audit_data = json.load(f)
+        audit_data = _read_audit(export_path)
 
         assert audit_data["task"]["task_description"] == ""
 
-    @pytest.mark.asyncio
     async def test_audit_export_path_with_spaces(
-        self, temp_work_dir: Path, monkeypatch: pytest.MonkeyPatch
+        self, temp_work_dir: Path, empty_plan: None
     ) -> None:
         """Export path with spaces is handled correctly."""
-        monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
 
         # Create directory with spaces
         dir_with_spaces = temp_work_dir / "audit reports"
@@ -901,22 +723,17 @@ class TestAuditExportEdgeCases:
             audit_export_path=str(export_path),
         )
 
-        with patch.object(agent, "_plan_changes", new_callable=AsyncMock) as mock_plan:
-            mock_plan.return_value = {"summary": "Nothing", "changes": []}
-            await agent.run("test")
+        await agent.run("test")
 
         assert export_path.exists()
-        with open(export_path) as f:
-            audit_data = json.load(f)
+        audit_data = _read_audit(export_path)
 
         assert "task" in audit_data
 
-    @pytest.mark.asyncio
     async def test_unicode_in_task_description_exported_correctly(
-        self, temp_work_dir: Path, monkeypatch: pytest.MonkeyPatch
+        self, temp_work_dir: Path, empty_plan: None
     ) -> None:
         """Unicode characters in task description are preserved in export."""
-        monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
         export_path = temp_work_dir / "audit-unicode.json"
 
         agent = SafeAgent(
@@ -927,25 +744,143 @@ class TestAuditExportEdgeCases:
 
         unicode_task = "Fix bug with emojis 🐛 and unicode characters: 日本語, العربية"
 
-        with patch.object(agent, "_plan_changes", new_callable=AsyncMock) as mock_plan:
-            mock_plan.return_value = {"summary": "Nothing", "changes": []}
-            await agent.run(unicode_task)
+        await agent.run(unicode_task)
 
-        with open(export_path, encoding="utf-8") as f:
-            audit_data = json.load(f)
+        audit_data = _read_audit(export_path)
 
         assert audit_data["task"]["task_description"] == unicode_task
+        # Non-ASCII text is written as raw UTF-8, not \uXXXX escapes
+        assert unicode_task.encode("utf-8") in export_path.read_bytes()
+
+
+class TestAuditExportCompression:
+    """Tests for optional zstd compression of large audit exports."""
+
+    async def test_auto_compress_keeps_small_audit_plain(
+        self, temp_work_dir: Path, empty_plan: None
+    ) -> None:
+        """Audits below the threshold are written as plain JSON."""
+        export_path = temp_work_dir / "audit.json"
+
+        agent = SafeAgent(
+            working_directory=str(temp_work_dir),
+            non_interactive=True,
+            audit_export_path=str(export_path),
+            audit_compress="auto",
+        )
+
+        result = await agent.run("test")
+
+        assert result["audit_export_path"] == str(export_path)
+        assert not export_path.with_name("audit.json.zst").exists()
+        assert _read_audit(export_path)["task"]["task_description"] == "test"
+
+    async def test_auto_compress_writes_zst_for_large_audit(
+        self, temp_work_dir: Path, empty_plan: None
+    ) -> None:
+        """Audits above the threshold are written zstd-compressed next to the path."""
+        pytest.importorskip("zstandard")
+        export_path = temp_work_dir / "audit.json"
+
+        agent = SafeAgent(
+            working_directory=str(temp_work_dir),
+            non_interactive=True,
+            audit_export_path=str(export_path),
+            audit_compress="auto",
+        )
+
+        large_task = "refactor " * 8192
+        await agent.run(large_task)
+
+        compressed_path = temp_work_dir / "audit.json.zst"
+        assert not export_path.exists()
+        assert compressed_path.exists()
+        assert compressed_path.stat().st_size < len(large_task)
+        assert _read_audit(compressed_path)["task"]["task_description"] == large_task
+
+    async def test_compress_true_writes_zst(self, temp_work_dir: Path, empty_plan: None) -> None:
+        """compress=True compresses regardless of audit size."""
+        pytest.importorskip("zstandard")
+        export_path = temp_work_dir / "audit.json"
+
+        agent = SafeAgent(
+            working_directory=str(temp_work_dir),
+            non_interactive=True,
+            audit_export_path=str(export_path),
+            audit_compress=True,
+        )
+
+        result = await agent.run("test")
+
+        compressed_path = temp_work_dir / "audit.json.zst"
+        assert result["audit_export_path"] == str(compressed_path)
+        assert not export_path.exists()
+        assert _read_audit(compressed_path)["task"]["task_description"] == "test"
+
+    def test_compressed_export_removes_stale_plain_audit(self, temp_work_dir: Path) -> None:
+        """Writing <path>.zst removes a plain audit left at <path> by an earlier export."""
+        pytest.importorskip("zstandard")
+        export_path = temp_work_dir / "audit.json"
+        export_path.write_text("{}", encoding="utf-8")
+        agent = SafeAgent(working_directory=str(temp_work_dir), non_interactive=True)
+
+        written = agent.export_audit_trail(str(export_path), compress=True)
+
+        assert written == temp_work_dir / "audit.json.zst"
+        assert not export_path.exists()
+
+    def test_plain_export_removes_stale_compressed_audit(self, temp_work_dir: Path) -> None:
+        """Writing plain JSON removes a <path>.zst left by an earlier compressed export."""
+        export_path = temp_work_dir / "audit.json"
+        stale_path = temp_work_dir / "audit.json.zst"
+        stale_path.write_bytes(b"stale")
+        agent = SafeAgent(working_directory=str(temp_work_dir), non_interactive=True)
+
+        written = agent.export_audit_trail(str(export_path), compress=False)
+
+        assert written == export_path
+        assert not stale_path.exists()
+
+    def test_compress_true_without_zstandard_writes_plain_json(
+        self,
+        temp_work_dir: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        """A compress=True export without zstandard still writes the audit, uncompressed."""
+        monkeypatch.setattr("safe_agent.agent.zstandard", None)
+        export_path = temp_work_dir / "audit.json"
+        agent = SafeAgent(working_directory=str(temp_work_dir), non_interactive=True)
+
+        written = agent.export_audit_trail(str(export_path), compress=True)
+
+        assert written == export_path
+        assert _read_audit(export_path)["audit_metadata"]["export_version"] == "1.0"
+        assert "'safe-agent-cli[zstd]'" in capsys.readouterr().out
+
+    def test_audit_compress_true_without_zstandard_is_rejected(
+        self, temp_work_dir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Requesting compression up front fails fast when zstandard is missing."""
+        monkeypatch.setattr("safe_agent.agent.zstandard", None)
+
+        with pytest.raises(ValueError, match=r"safe-agent-cli\[zstd\]"):
+            SafeAgent(working_directory=str(temp_work_dir), audit_compress=True)
+
+    @pytest.mark.parametrize("value", ["yes", "zstd", 1, None])
+    def test_unknown_audit_compress_is_rejected(self, temp_work_dir: Path, value: object) -> None:
+        """Only True, False and "auto" are accepted."""
+        with pytest.raises(ValueError, match="audit_compress must be"):
+            SafeAgent(working_directory=str(temp_work_dir), audit_compress=value)
 
 
 class TestAuditExportJSONSchemaStrictness:
     """Tests that would catch bugs if implementation is wrong."""
 
-    @pytest.mark.asyncio
     async def test_changes_is_list_not_dict(
-        self, temp_work_dir: Path, monkeypatch: pytest.MonkeyPatch
+        self, temp_work_dir: Path, empty_plan: None
     ) -> None:
         """Changes field must be a list, not a dict."""
-        monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
         export_path = temp_work_dir / "audit-schema.json"
 
         agent = SafeAgent(
@@ -954,21 +889,16 @@ class TestAuditExportJSONSchemaStrictness:
             audit_export_path=str(export_path),
         )
 
-        with patch.object(agent, "_plan_changes", new_callable=AsyncMock) as mock_plan:
-            mock_plan.return_value = {"summary": "Nothing", "changes": []}
-            await agent.run("test")
+        await agent.run("test")
 
-        with open(export_path) as f:
-            audit_data = json.load(f)
+        audit_data = _read_audit(export_path)
 
         assert isinstance(audit_data["changes"], list)
 
-    @pytest.mark.asyncio
     async def test_summary_values_are_correct_types(
-        self, temp_work_dir: Path, monkeypatch: pytest.MonkeyPatch
+        self, temp_work_dir: Path, empty_plan: None
     ) -> None:
         """Summary values must be correct types (int, str, float)."""
-        monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
         export_path = temp_work_dir / "audit-types.json"
 
         agent = SafeAgent(
@@ -977,12 +907,9 @@ class TestAuditExportJSONSchemaStrictness:
             audit_export_path=str(export_path),
         )
 
-        with patch.object(agent, "_plan_changes", new_callable=AsyncMock) as mock_plan:
-            mock_plan.return_value = {"summary": "Nothing", "changes": []}
-            await agent.run("test")
+        await agent.run("test")
 
-        with open(export_path) as f:
-            audit_data = json.load(f)
+        audit_data = _read_audit(export_path)
 
         summary = audit_data["summary"]
         assert isinstance(summary["total_changes_planned"], int)
@@ -995,12 +922,10 @@ class TestAuditExportJSONSchemaStrictness:
             summary["max_risk_level_seen"], str
         )
 
-    @pytest.mark.asyncio
     async def test_compliance_flags_are_booleans(
-        self, temp_work_dir: Path, monkeypatch: pytest.MonkeyPatch
+        self, temp_work_dir: Path, empty_plan: None
     ) -> None:
         """Compliance flags must be boolean values, not strings."""
-        monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
         export_path = temp_work_dir / "audit-bool.json"
 
         agent = SafeAgent(
@@ -1009,12 +934,9 @@ class TestAuditExportJSONSchemaStrictness:
             audit_export_path=str(export_path),
         )
 
-        with patch.object(agent, "_plan_changes", new_callable=AsyncMock) as mock_plan:
-            mock_plan.return_value = {"summary": "Nothing", "changes": []}
-            await agent.run("test")
+        await agent.run("test")
 
-        with open(export_path) as f:
-            audit_data = json.load(f)
+        audit_data = _read_audit(export_path)
 
         flags = audit_data["compliance_flags"]
         assert isinstance(flags["compliance_mode_enabled"], bool)
@@ -1022,12 +944,10 @@ class TestAuditExportJSONSchemaStrictness:
         assert isinstance(flags["policy_file_present"], bool)
         assert isinstance(flags["audit_trail_complete"], bool)
 
-    @pytest.mark.asyncio
     async def test_working_directory_is_absolute_path(
-        self, temp_work_dir: Path, monkeypatch: pytest.MonkeyPatch
+        self, temp_work_dir: Path, empty_plan: None
     ) -> None:
         """Working directory in audit must be absolute path."""
-        monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
         export_path = temp_work_dir / "audit-path.json"
 
         agent = SafeAgent(
@@ -1036,22 +956,17 @@ class TestAuditExportJSONSchemaStrictness:
             audit_export_path=str(export_path),
         )
 
-        with patch.object(agent, "_plan_changes", new_callable=AsyncMock) as mock_plan:
-            mock_plan.return_value = {"summary": "Nothing", "changes": []}
-            await agent.run("test")
+        await agent.run("test")
 
-        with open(export_path) as f:
-            audit_data = json.load(f)
+        audit_data = _read_audit(export_path)
 
         working_dir = audit_data["task"]["working_directory"]
         assert Path(working_dir).is_absolute()
 
-    @pytest.mark.asyncio
     async def test_policy_violations_always_present_even_if_zero(
-        self, temp_work_dir: Path, monkeypatch: pytest.MonkeyPatch
+        self, temp_work_dir: Path, empty_plan: None
     ) -> None:
         """Policy violations field must always be present, even if 0."""
-        monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
         export_path = temp_work_dir / "audit-policy.json"
 
         agent = SafeAgent(
@@ -1060,12 +975,9 @@ class TestAuditExportJSONSchemaStrictness:
             audit_export_path=str(export_path),
         )
 
-        with patch.object(agent, "_plan_changes", new_callable=AsyncMock) as mock_plan:
-            mock_plan.return_value = {"summary": "Nothing", "changes": []}
-            await agent.run("test")
+        await agent.run("test")
 
-        with open(export_path) as f:
-            audit_data = json.load(f)
+        audit_data = _read_audit(export_path)
 
         # Field must exist
         assert "policy_violations" in audit_data["summary"]
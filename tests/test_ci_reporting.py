@@ -107,3 +107,21 @@ def test_machine_report_uses_requires_approval_status(safe_agent: SafeAgent) ->
     assert report["schema_version"] == "1"
     assert report["run_status"] == "requires_approval"
     assert report["success"] is False
+
+
+def test_reports_reflect_events_recorded_after_first_build(safe_agent: SafeAgent) -> None:
+    assert safe_agent.build_policy_report()["blocking_rule_ids"] == []
+
+    safe_agent._record_governance_event(
+        path=".env",
+        action="modify",
+        risk_level=RiskLevel.HIGH,
+        policy_decision="deny",
+        matched_rule_id="deny-secrets",
+        scanner_severity="none",
+        scanner_reason_ids=[],
+        outcome="blocked_by_policy_deny",
+    )
+
+    assert safe_agent.build_policy_report()["blocking_rule_ids"] == ["deny-secrets"]
+    assert "`deny-secrets`" in safe_agent.build_ci_summary()
@@ -2,9 +2,13 @@
 
 import json
 import subprocess
+from collections.abc import Callable
 from pathlib import Path
+from typing import ClassVar
 
-from click.testing import CliRunner
+import pytest
+from click.testing import CliRunner, Result
+from helpers import json_loads
 
 from safe_agent import __version__
 from safe_agent.cli import main
@@ -12,9 +16,19 @@ from safe_agent.cli import main
 runner = CliRunner()
 
 
+def _invoke(args: list[str]) -> Result:
+    """
+    Invoke the CLI without Click's standalone error handling.
+
+    Every CLI path ends in an explicit ``sys.exit``, which the runner still records as
+    ``exit_code``; anything else escaping is a bug and should surface as a traceback.
+    """
+    return runner.invoke(main, args, standalone_mode=False, catch_exceptions=False)
+
+
 def test_safe_agent_help() -> None:
     """CLI responds to --help without error."""
-    result = runner.invoke(main, ["--help"])
+    result = _invoke(["--help"])
     assert result.exit_code == 0
     assert "Safe Agent" in result.output or "safe-agent" in result.output.lower()
     assert "dry-run" in result.output or "dry_run" in result.output
@@ -22,7 +36,7 @@ def test_safe_agent_help() -> None:
 
 def test_safe_agent_version_option() -> None:
     """CLI responds to --version with package version."""
-    result = runner.invoke(main, ["--version"])
+    result = _invoke(["--version"])
     assert result.exit_code == 0
     assert "safe-agent" in result.output.lower()
     assert __version__ in result.output
@@ -30,12 +44,15 @@ def test_safe_agent_version_option() -> None:
 
 def test_safe_agent_requires_task_without_args() -> None:
     """CLI exits non-zero when no task and no --file/--interactive."""
-    result = runner.invoke(main, [])
+    result = _invoke([])
     assert result.exit_code != 0
     assert "task" in result.output.lower() or "ANTHROPIC" in result.output
 
 
-def test_adversarial_suite_runs_without_api_key() -> None:
+def test_adversarial_suite_runs_without_api_key(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    monkeypatch.delenv("ANTHROPIC_API_KEY", raising=False)
     payload = {
         "cases": [
             {
@@ -53,17 +70,16 @@ def test_adversarial_suite_runs_without_api_key() -> None:
         ]
     }
 
-    with runner.isolated_filesystem():
-        suite_path = Path("suite.json")
-        suite_path.write_text(json.dumps(payload), encoding="utf-8")
+    suite_path = tmp_path / "suite.json"
+    suite_path.write_text(json.dumps(payload), encoding="utf-8")
 
-        result = runner.invoke(main, ["--adversarial-suite", str(suite_path)])
-        assert result.exit_code == 0
-        assert "Safe Agent Adversarial Evaluation" in result.output
-        assert "Impact Preview" not in result.output
+    result = _invoke(["--adversarial-suite", str(suite_path)])
+    assert result.exit_code == 0
+    assert "Safe Agent Adversarial Evaluation" in result.output
+    assert "Impact Preview" not in result.output
 
 
-def test_adversarial_suite_exits_3_when_case_fails() -> None:
+def test_adversarial_suite_exits_3_when_case_fails(tmp_path: Path) -> None:
     payload = {
         "cases": [
             {
@@ -81,26 +97,24 @@ def test_adversarial_suite_exits_3_when_case_fails() -> None:
         ]
     }
 
-    with runner.isolated_filesystem():
-        suite_path = Path("suite.json")
-        suite_path.write_text(json.dumps(payload), encoding="utf-8")
-        json_out = Path("out/report.json")
-        md_out = Path("out/report.md")
-
-        result = runner.invoke(
-            main,
-            [
-                "--adversarial-suite",
-                str(suite_path),
-                "--adversarial-json-out",
-                str(json_out),
-                "--adversarial-markdown-out",
-                str(md_out),
-            ],
-        )
-        assert result.exit_code == 3
-        assert json_out.exists()
-        assert md_out.exists()
+    suite_path = tmp_path / "suite.json"
+    suite_path.write_text(json.dumps(payload), encoding="utf-8")
+    json_out = tmp_path / "out" / "report.json"
+    md_out = tmp_path / "out" / "report.md"
+
+    result = _invoke(
+        [
+            "--adversarial-suite",
+            str(suite_path),
+            "--adversarial-json-out",
+            str(json_out),
+            "--adversarial-markdown-out",
+            str(md_out),
+        ],
+    )
+    assert result.exit_code == 3
+    assert json_out.exists()
+    assert md_out.exists()
 
 
 def test_safe_agent_mcp_imports() -> None:
@@ -109,58 +123,6 @@ def test_safe_agent_mcp_imports() -> None:
     assert callable(run)
 
 
-def test_ci_summary_and_policy_report_files_are_written(monkeypatch) -> None:
-    """CLI writes CI summary and policy report artifacts when requested."""
-
-    class DummyAgent:
-        def __init__(self, **kwargs) -> None:
-            self.kwargs = kwargs
-
-        async def run(self, task: str) -> dict:
-            return {"success": True}
-
-        def build_ci_summary(self) -> str:
-            return "### Safe Agent CI Summary\n- Result: ✅ PASS\n"
-
-        def build_policy_report(self) -> dict:
-            return {"status": "passed", "events": []}
-
-        def build_safety_scorecard(self) -> str:
-            return "### Safe Agent Safety Scorecard\n- Result: ✅ PASS\n"
-
-    monkeypatch.setattr("safe_agent.cli.SafeAgent", DummyAgent)
-
-    with runner.isolated_filesystem():
-        summary_path = Path("out/summary.md")
-        report_path = Path("out/policy.json")
-        scorecard_path = Path("out/scorecard.md")
-
-        result = runner.invoke(
-            main,
-            [
-                "scan repo",
-                "--non-interactive",
-                "--dry-run",
-                "--ci-summary-file",
-                str(summary_path),
-                "--policy-report",
-                str(report_path),
-                "--safety-scorecard-file",
-                str(scorecard_path),
-            ],
-            env={"ANTHROPIC_API_KEY": "test-key"},
-        )
-
-        assert result.exit_code == 0
-        assert summary_path.exists()
-        assert "Safe Agent CI Summary" in summary_path.read_text(encoding="utf-8")
-        assert report_path.exists()
-        report = json.loads(report_path.read_text(encoding="utf-8"))
-        assert report["status"] == "passed"
-        assert scorecard_path.exists()
-        assert "Safety Scorecard" in scorecard_path.read_text(encoding="utf-8")
-
-
 def test_invalid_policy_preset_shows_guidance(monkeypatch) -> None:
     """CLI should surface actionable guidance when preset lookup fails."""
 
@@ -169,10 +131,8 @@ def test_invalid_policy_preset_shows_guidance(monkeypatch) -> None:
             raise ValueError("Unknown policy preset: nope")
 
     monkeypatch.setattr("safe_agent.cli.SafeAgent", BadPresetAgent)
-    result = runner.invoke(
-        main,
+    result = _invoke(
         ["scan repo", "--policy-preset", "nope", "--dry-run", "--non-interactive"],
-        env={"ANTHROPIC_API_KEY": "test-key"},
     )
 
     assert result.exit_code == 1
@@ -180,81 +140,117 @@ def test_invalid_policy_preset_shows_guidance(monkeypatch) -> None:
     assert "list-policy-presets" in result.output
 
 
-def test_policy_preset_is_passed_to_agent(monkeypatch) -> None:
-    """CLI wires --policy-preset through to SafeAgent constructor."""
+class _DummyAgent:
+    """SafeAgent stand-in that records constructor kwargs and reports a fixed outcome."""
 
-    captured: dict[str, object] = {}
+    run_success: ClassVar[bool] = True
+    last_kwargs: ClassVar[dict[str, object]] = {}
 
-    class DummyAgent:
-        def __init__(self, **kwargs) -> None:
-            captured.update(kwargs)
+    def __init__(self, **kwargs) -> None:
+        type(self).last_kwargs = kwargs
 
-        async def run(self, task: str) -> dict:
-            return {"success": True}
+    async def run(self, task: str) -> dict:
+        return {"success": self.run_success}
 
-        def build_ci_summary(self) -> str:
-            return "ok"
+    def build_ci_summary(self) -> str:
+        result = "✅ PASS" if self.run_success else "FAIL"
+        return f"### Safe Agent CI Summary\n- Result: {result}\n"
 
-        def build_policy_report(self) -> dict:
-            return {"status": "passed"}
+    def build_policy_report(self) -> dict:
+        if self.run_success:
+            return {"status": "passed", "events": []}
+        return {"status": "failed", "events": [{"outcome": "blocked_by_fail_on_risk"}]}
 
-    monkeypatch.setattr("safe_agent.cli.SafeAgent", DummyAgent)
-    result = runner.invoke(
-        main,
-        ["scan repo", "--policy-preset", "fintech", "--dry-run", "--non-interactive"],
-        env={"ANTHROPIC_API_KEY": "test-key"},
-    )
+    def build_safety_scorecard(self) -> str:
+        result = "✅ PASS" if self.run_success else "❌ FAIL"
+        return f"### Safe Agent Safety Scorecard\n- Result: {result}\n"
 
-    assert result.exit_code == 0
-    assert captured.get("policy_preset") == "fintech"
 
+@pytest.fixture
+def cli_env(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> Path:
+    """Swap SafeAgent for _DummyAgent in the CLI and return the artifact output directory."""
+    monkeypatch.setattr("safe_agent.cli.SafeAgent", _DummyAgent)
+    monkeypatch.setattr(_DummyAgent, "last_kwargs", {})
+    return tmp_path / "out"
 
-def test_policy_report_written_even_when_run_fails(monkeypatch) -> None:
-    """CI artifacts should still be written when SafeAgent exits non-success."""
 
-    class FailingAgent:
-        def __init__(self, **kwargs) -> None:
-            pass
+def _check_artifacts_written(out: Path) -> None:
+    assert "Safe Agent CI Summary" in (out / "summary.md").read_text(encoding="utf-8")
+    report = json_loads((out / "policy.json").read_bytes())
+    assert report["status"] == "passed"
+    assert "Safety Scorecard" in (out / "scorecard.md").read_text(encoding="utf-8")
 
-        async def run(self, task: str) -> dict:
-            return {"success": False}
 
-        def build_ci_summary(self) -> str:
-            return "### Safe Agent CI Summary\n- Result: FAIL\n"
+def _check_preset_forwarded(out: Path) -> None:
+    assert _DummyAgent.last_kwargs.get("policy_preset") == "fintech"
 
-        def build_policy_report(self) -> dict:
-            return {"status": "failed", "events": [{"outcome": "blocked_by_fail_on_risk"}]}
 
-        def build_safety_scorecard(self) -> str:
-            return "### Safe Agent Safety Scorecard\n- Result: ❌ FAIL\n"
+def _check_artifacts_written_on_failure(out: Path) -> None:
+    report = json_loads((out / "policy.json").read_bytes())
+    assert report["status"] == "failed"
+    assert "❌ FAIL" in (out / "scorecard.md").read_text(encoding="utf-8")
 
-    monkeypatch.setattr("safe_agent.cli.SafeAgent", FailingAgent)
 
-    with runner.isolated_filesystem():
-        report_path = Path("out/policy.json")
-        scorecard_path = Path("out/scorecard.md")
-        result = runner.invoke(
-            main,
+@pytest.mark.parametrize(
+    ("run_success", "args", "expected_exit", "check"),
+    [
+        pytest.param(
+            True,
+            [
+                "--ci-summary-file",
+                "{out}/summary.md",
+                "--policy-report",
+                "{out}/policy.json",
+                "--safety-scorecard-file",
+                "{out}/scorecard.md",
+            ],
+            0,
+            _check_artifacts_written,
+            id="ci-summary-and-policy-report-files-written",
+        ),
+        pytest.param(
+            True,
+            ["--policy-preset", "fintech"],
+            0,
+            _check_preset_forwarded,
+            id="policy-preset-passed-to-agent",
+        ),
+        pytest.param(
+            False,
             [
-                "scan repo",
-                "--non-interactive",
-                "--dry-run",
                 "--policy-report",
-                str(report_path),
+                "{out}/policy.json",
                 "--safety-scorecard-file",
-                str(scorecard_path),
+                "{out}/scorecard.md",
             ],
-            env={"ANTHROPIC_API_KEY": "test-key"},
-        )
-        assert result.exit_code == 2
-        assert report_path.exists()
-        report = json.loads(report_path.read_text(encoding="utf-8"))
-        assert report["status"] == "failed"
-        assert scorecard_path.exists()
-        assert "❌ FAIL" in scorecard_path.read_text(encoding="utf-8")
+            2,
+            _check_artifacts_written_on_failure,
+            id="policy-report-written-even-when-run-fails",
+        ),
+    ],
+)
+def test_cli_with_dummy_agent(
+    cli_env: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    run_success: bool,
+    args: list[str],
+    expected_exit: int,
+    check: Callable[[Path], None],
+) -> None:
+    """CLI wires options through to the agent and writes CI artifacts for either outcome."""
+    monkeypatch.setattr(_DummyAgent, "run_success", run_success)
+
+    result = _invoke(
+        ["scan repo", "--non-interactive", "--dry-run", *(arg.format(out=cli_env) for arg in args)],
+    )
+
+    assert result.exit_code == expected_exit
+    check(cli_env)
 
 
-def test_json_out_written_on_success(monkeypatch) -> None:
+def test_json_out_written_on_success(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
     """CLI writes machine-readable output JSON when requested."""
 
     class DummyAgent:
@@ -269,29 +265,28 @@ def test_json_out_written_on_success(monkeypatch) -> None:
 
     monkeypatch.setattr("safe_agent.cli.SafeAgent", DummyAgent)
 
-    with runner.isolated_filesystem():
-        json_path = Path("out/run.json")
-        result = runner.invoke(
-            main,
-            [
-                "scan repo",
-                "--non-interactive",
-                "--dry-run",
-                "--json-out",
-                str(json_path),
-            ],
-            env={"ANTHROPIC_API_KEY": "test-key"},
-        )
-        assert result.exit_code == 0
-        assert json_path.exists()
-        payload = json.loads(json_path.read_text(encoding="utf-8"))
-        assert payload["schema_version"] == "1"
-        assert payload["run_status"] == "passed"
-        assert payload["success"] is True
-        assert payload["policy_report"]["status"] == "passed"
-
-
-def test_json_out_written_on_runtime_error(monkeypatch) -> None:
+    json_path = tmp_path / "out" / "run.json"
+    result = _invoke(
+        [
+            "scan repo",
+            "--non-interactive",
+            "--dry-run",
+            "--json-out",
+            str(json_path),
+        ],
+    )
+    assert result.exit_code == 0
+    assert json_path.exists()
+    payload = json_loads(json_path.read_bytes())
+    assert payload["schema_version"] == "1"
+    assert payload["run_status"] == "passed"
+    assert payload["success"] is True
+    assert payload["policy_report"]["status"] == "passed"
+
+
+def test_json_out_written_on_runtime_error(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
     """CLI writes machine output even when runtime setup fails."""
 
     class RuntimeErrorAgent:
@@ -300,25 +295,22 @@ def test_json_out_written_on_runtime_error(monkeypatch) -> None:
 
     monkeypatch.setattr("safe_agent.cli.SafeAgent", RuntimeErrorAgent)
 
-    with runner.isolated_filesystem():
-        json_path = Path("out/run.json")
-        result = runner.invoke(
-            main,
-            [
-                "scan repo",
-                "--non-interactive",
-                "--dry-run",
-                "--json-out",
-                str(json_path),
-            ],
-            env={"ANTHROPIC_API_KEY": "test-key"},
-        )
-        assert result.exit_code == 1
-        assert json_path.exists()
-        payload = json.loads(json_path.read_text(encoding="utf-8"))
-        assert payload["run_status"] == "error"
-        assert payload["success"] is False
-        assert "governance init failed" in payload["error"]
+    json_path = tmp_path / "out" / "run.json"
+    result = _invoke(
+        [
+            "scan repo",
+            "--non-interactive",
+            "--dry-run",
+            "--json-out",
+            str(json_path),
+        ],
+    )
+    assert result.exit_code == 1
+    assert json_path.exists()
+    payload = json_loads(json_path.read_bytes())
+    assert payload["run_status"] == "error"
+    assert payload["success"] is False
+    assert "governance init failed" in payload["error"]
 
 
 def _git(*args: str) -> None:
@@ -327,69 +319,75 @@ def _git(*args: str) -> None:
         raise RuntimeError(result.stderr.strip() or result.stdout.strip() or "git command failed")
 
 
-def test_diff_gate_runs_without_api_key() -> None:
-    with runner.isolated_filesystem():
-        _git("init")
-        _git("config", "user.email", "test@example.com")
-        _git("config", "user.name", "Safe Agent Test")
-        Path("README.md").write_text("hello\n", encoding="utf-8")
-        _git("add", "README.md")
-        _git("commit", "-m", "init")
-
-        Path("README.md").write_text("hello world\n", encoding="utf-8")
-
-        result = runner.invoke(main, ["--diff-gate", "--non-interactive"])
-        assert result.exit_code == 0
-        assert "Diff Gate" in result.output
-
+def test_diff_gate_runs_without_api_key(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    monkeypatch.delenv("ANTHROPIC_API_KEY", raising=False)
+    monkeypatch.chdir(tmp_path)
+    _git("init")
+    _git("config", "user.email", "test@example.com")
+    _git("config", "user.name", "Safe Agent Test")
+    Path("README.md").write_text("hello\n", encoding="utf-8")
+    _git("add", "README.md")
+    _git("commit", "-m", "init")
 
-def test_diff_gate_fail_on_risk_blocks_and_writes_json() -> None:
-    with runner.isolated_filesystem():
-        _git("init")
-        _git("config", "user.email", "test@example.com")
-        _git("config", "user.name", "Safe Agent Test")
-        Path("README.md").write_text("hello\n", encoding="utf-8")
-        _git("add", "README.md")
-        _git("commit", "-m", "init")
+    Path("README.md").write_text("hello world\n", encoding="utf-8")
 
-        Path("README.md").write_text("hello world\n", encoding="utf-8")
-        out_path = Path("out/run.json")
-        result = runner.invoke(
-            main,
-            [
-                "--diff-gate",
-                "--non-interactive",
-                "--fail-on-risk",
-                "low",
-                "--json-out",
-                str(out_path),
-            ],
-        )
-        assert result.exit_code == 2
-        assert out_path.exists()
-        payload = json.loads(out_path.read_text(encoding="utf-8"))
-        assert payload["run_status"] == "blocked"
-        assert payload["policy_report"]["risk_policy_failed"] is True
-
-
-def test_diff_gate_with_diff_ref() -> None:
-    with runner.isolated_filesystem():
-        _git("init")
-        _git("config", "user.email", "test@example.com")
-        _git("config", "user.name", "Safe Agent Test")
-        Path("README.md").write_text("hello\n", encoding="utf-8")
-        _git("add", "README.md")
-        _git("commit", "-m", "init")
-
-        Path("README.md").write_text("hello world\n", encoding="utf-8")
-        _git("add", "README.md")
-        _git("commit", "-m", "second")
-
-        result = runner.invoke(main, ["--diff-gate", "--diff-ref", "HEAD~1", "--non-interactive"])
-        assert result.exit_code == 0
+    result = _invoke(["--diff-gate", "--non-interactive"])
+    assert result.exit_code == 0
+    assert "Diff Gate" in result.output
+
+
+def test_diff_gate_fail_on_risk_blocks_and_writes_json(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    _git("init")
+    _git("config", "user.email", "test@example.com")
+    _git("config", "user.name", "Safe Agent Test")
+    Path("README.md").write_text("hello\n", encoding="utf-8")
+    _git("add", "README.md")
+    _git("commit", "-m", "init")
+
+    Path("README.md").write_text("hello world\n", encoding="utf-8")
+    out_path = Path("out/run.json")
+    result = _invoke(
+        [
+            "--diff-gate",
+            "--non-interactive",
+            "--fail-on-risk",
+            "low",
+            "--json-out",
+            str(out_path),
+        ],
+    )
+    assert result.exit_code == 2
+    assert out_path.exists()
+    payload = json_loads(out_path.read_bytes())
+    assert payload["run_status"] == "blocked"
+    assert payload["policy_report"]["risk_policy_failed"] is True
+
+
+def test_diff_gate_with_diff_ref(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    _git("init")
+    _git("config", "user.email", "test@example.com")
+    _git("config", "user.name", "Safe Agent Test")
+    Path("README.md").write_text("hello\n", encoding="utf-8")
+    _git("add", "README.md")
+    _git("commit", "-m", "init")
+
+    Path("README.md").write_text("hello world\n", encoding="utf-8")
+    _git("add", "README.md")
+    _git("commit", "-m", "second")
+
+    result = _invoke(["--diff-gate", "--diff-ref", "HEAD~1", "--non-interactive"])
+    assert result.exit_code == 0
 
 
 def test_diff_gate_rejects_unsafe_diff_ref() -> None:
-    result = runner.invoke(main, ["--diff-gate", "--diff-ref", "--bad-ref"])
+    result = _invoke(["--diff-gate", "--diff-ref", "--bad-ref"])
     assert result.exit_code == 1
     assert "diff_ref cannot start with '-'" in result.output
@@ -2,36 +2,44 @@
 
 from __future__ import annotations
 
-import json
+import functools
+import os
 import re
 from pathlib import Path
 
+from helpers import json_loads
 
+# Opening "---" line, at least one line of content, closing "---" line.
+_FRONTMATTER_RE = re.compile(rb"---[ \t]*\r?\n.*?\r?\n---[ \t]*(?:\r?\n|\Z)", re.DOTALL)
+_NAME_RE = re.compile(r"[a-z0-9]+(?:-[a-z0-9]+)*")
+_VER_RE = re.compile(r"\d+\.\d+\.\d+")
+# Frontmatter sits at the top of each asset; no need to read the whole file.
+_FRONTMATTER_PREFIX_BYTES = 1024
+
+
+@functools.lru_cache(maxsize=1)
 def _repo_root() -> Path:
     return Path(__file__).resolve().parents[1]
 
 
+_MANIFEST = json_loads((_repo_root() / ".cursor-plugin" / "plugin.json").read_bytes())
+
+
 def _has_frontmatter(path: Path) -> bool:
-    text = path.read_text(encoding="utf-8")
-    lines = text.splitlines()
-    if len(lines) < 3:
-        return False
-    if lines[0].strip() != "---":
-        return False
+    fd = os.open(path, os.O_RDONLY)
     try:
-        end_index = lines.index("---", 1)
-    except ValueError:
-        return False
-    return end_index > 1
+        head = os.read(fd, _FRONTMATTER_PREFIX_BYTES)
+    finally:
+        os.close(fd)
+    return _FRONTMATTER_RE.match(head) is not None
 
 
 def test_cursor_plugin_manifest_is_valid() -> None:
     repo = _repo_root()
-    manifest_path = repo / ".cursor-plugin" / "plugin.json"
-    manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    manifest = _MANIFEST
 
-    assert re.fullmatch(r"[a-z0-9]+(?:-[a-z0-9]+)*", manifest["name"])
-    assert re.fullmatch(r"\d+\.\d+\.\d+", manifest["version"])
+    assert _NAME_RE.fullmatch(manifest["name"])
+    assert _VER_RE.fullmatch(manifest["version"])
     assert isinstance(manifest["description"], str) and manifest["description"].strip()
     assert manifest["license"] == "MIT"
     assert manifest["repository"].startswith("https://")
@@ -46,7 +54,7 @@ def test_cursor_plugin_manifest_is_valid() -> None:
 def test_cursor_plugin_mcp_server_config_is_safe() -> None:
     repo = _repo_root()
     mcp_path = repo / ".mcp.json"
-    payload = json.loads(mcp_path.read_text(encoding="utf-8"))
+    payload = json_loads(mcp_path.read_bytes())
     server = payload["mcpServers"]["safe-agent"]
 
     command = server["command"]
@@ -13,9 +13,9 @@ as documented in docs/eu-ai-act-compliance.md:
 from __future__ import annotations
 
 import datetime
-import json
+from collections.abc import Callable
 from pathlib import Path
-from unittest.mock import AsyncMock, Mock, patch
+from unittest.mock import AsyncMock
 
 import pytest
 
@@ -24,20 +24,39 @@ try:
 except ModuleNotFoundError:
     from impact_preview.actions.models import RiskLevel
 
-from safe_agent.agent import SafeAgent
+from helpers import PREVIEWS, async_return, json_loads
 
+from safe_agent.agent import SafeAgent, _dump_audit_json
 
-def _mock_preview(
-    risk_level: RiskLevel,
-    risk_factors: list[str] | None = None,
-    file_changes: list | None = None,
-) -> Mock:
-    """Create a mock preview object for testing."""
-    return Mock(
-        risk_level=risk_level,
-        risk_factors=risk_factors or [],
-        file_changes=file_changes or [],
+
+@pytest.fixture
+def audit_writes(monkeypatch: pytest.MonkeyPatch) -> dict[Path, bytes]:
+    """Capture audit exports in memory, keyed by target path, instead of writing them."""
+    writes: dict[Path, bytes] = {}
+    monkeypatch.setattr("safe_agent.agent._write_audit_file", writes.__setitem__)
+    return writes
+
+
+@pytest.fixture(scope="module")
+async def baseline_export(tmp_path_factory: pytest.TempPathFactory) -> bytes:
+    """Raw audit export of one no-op ``run()`` outside compliance mode, shared by the module."""
+    work_dir = tmp_path_factory.mktemp("baseline-audit").resolve()
+    export_path = work_dir / "audit.json"
+    agent = SafeAgent(
+        working_directory=str(work_dir),
+        non_interactive=True,
+        audit_export_path=str(export_path),
+        compliance_mode=False,
     )
+    agent._plan_changes = async_return({"summary": "Test", "changes": []})
+    await agent.run("test")
+    return export_path.read_bytes()
+
+
+@pytest.fixture(scope="module")
+def baseline_audit(baseline_export: bytes) -> dict:
+    """Parsed ``baseline_export``; treat as read-only."""
+    return json_loads(baseline_export)
 
 
 # =============================================================================
@@ -45,35 +64,35 @@ def _mock_preview(
 # =============================================================================
 
 
+_EMPTY_RUN_TASK = "Update production database schema"
+
+
+@pytest.fixture(scope="class")
+def empty_run_audit(tmp_path_factory: pytest.TempPathFactory) -> dict:
+    """Finalize the audit for a no-op task and return it as serialized for export.
+
+    The field-level checks only concern what the audit records, so this skips
+    the plan/approve loop in ``run()`` and round-trips the finalized trail
+    through the exporter's JSON encoder.
+    """
+    work_dir = tmp_path_factory.mktemp("article12").resolve()
+    agent = SafeAgent(working_directory=str(work_dir), non_interactive=True)
+    agent._finalize_audit_trail(_EMPTY_RUN_TASK)
+    return json_loads(_dump_audit_json(agent.build_audit_export()))
+
+
 class TestArticle12RecordKeeping:
     """
     Article 12 requires logging capabilities for traceability.
     Tests verify audit logs contain required information.
     """
 
-    @pytest.mark.asyncio
-    async def test_audit_log_has_iso8601_timestamps(
-        self, temp_work_dir: Path, monkeypatch: pytest.MonkeyPatch
-    ) -> None:
+    def test_audit_log_has_iso8601_timestamps(self, empty_run_audit: dict) -> None:
         """
         Article 12: Audit logs must have timestamps in ISO 8601 format.
         This format is internationally recognized and retention-friendly.
         """
-        monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
-        export_path = temp_work_dir / "audit.json"
-
-        agent = SafeAgent(
-            working_directory=str(temp_work_dir),
-            non_interactive=True,
-            audit_export_path=str(export_path),
-        )
-
-        with patch.object(agent, "_plan_changes", new_callable=AsyncMock) as mock_plan:
-            mock_plan.return_value = {"summary": "Test", "changes": []}
-            await agent.run("test task")
-
-        with open(export_path) as f:
-            audit_data = json.load(f)
+        audit_data = empty_run_audit
 
         # Verify timestamps exist and are ISO 8601
         requested_at = audit_data["task"]["requested_at"]
@@ -92,159 +111,92 @@ class TestArticle12RecordKeeping:
             "+00:00"
         )
 
-    @pytest.mark.asyncio
-    async def test_audit_log_has_requester_information(
-        self, temp_work_dir: Path, monkeypatch: pytest.MonkeyPatch
-    ) -> None:
+    def test_audit_log_has_requester_information(self, empty_run_audit: dict) -> None:
         """
         Article 12: Must record who requested the operation.
         Required for accountability and compliance audits.
         """
-        monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
-        export_path = temp_work_dir / "audit.json"
-
-        agent = SafeAgent(
-            working_directory=str(temp_work_dir),
-            non_interactive=True,
-            audit_export_path=str(export_path),
-        )
-
-        with patch.object(agent, "_plan_changes", new_callable=AsyncMock) as mock_plan:
-            mock_plan.return_value = {"summary": "Test", "changes": []}
-            await agent.run("test task")
-
-        with open(export_path) as f:
-            audit_data = json.load(f)
+        audit_data = empty_run_audit
 
         # Requester must be recorded
         assert "requested_by" in audit_data["task"]
         assert audit_data["task"]["requested_by"]  # Not empty
         assert isinstance(audit_data["task"]["requested_by"], str)
 
-    @pytest.mark.asyncio
-    async def test_audit_log_has_task_description(
-        self, temp_work_dir: Path, monkeypatch: pytest.MonkeyPatch
-    ) -> None:
+    def test_audit_log_has_task_description(self, empty_run_audit: dict) -> None:
         """
         Article 12: Must record what operation was requested.
         Critical for understanding intent during audits.
         """
-        monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
-        export_path = temp_work_dir / "audit.json"
-
-        agent = SafeAgent(
-            working_directory=str(temp_work_dir),
-            non_interactive=True,
-            audit_export_path=str(export_path),
-        )
-
-        task_description = "Update production database schema"
-
-        with patch.object(agent, "_plan_changes", new_callable=AsyncMock) as mock_plan:
-            mock_plan.return_value = {"summary": "Test", "changes": []}
-            await agent.run(task_description)
-
-        with open(export_path) as f:
-            audit_data = json.load(f)
-
         # Task description must be recorded exactly
-        assert audit_data["task"]["task_description"] == task_description
+        assert empty_run_audit["task"]["task_description"] == _EMPTY_RUN_TASK
 
-    @pytest.mark.asyncio
     async def test_audit_log_has_risk_assessment(
-        self, temp_work_dir: Path, monkeypatch: pytest.MonkeyPatch
+        self,
+        compliance_agent: tuple[SafeAgent, Path],
+        make_plan: Callable[..., None],
+        audit_writes: dict[Path, bytes],
     ) -> None:
         """
         Article 12: Must record risk assessment results.
         Required to demonstrate risk management system.
         """
-        monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
-        export_path = temp_work_dir / "audit.json"
-
-        agent = SafeAgent(
-            working_directory=str(temp_work_dir),
-            non_interactive=True,
-            audit_export_path=str(export_path),
+        agent, export_path = compliance_agent
+        make_plan(
+            agent,
+            [
+                {
+                    "action": "modify",
+                    "path": "config.py",
+                    "description": "Update config",
+                    "content": "CONFIG='production'",
+                }
+            ],
+            previews=[PREVIEWS[RiskLevel.HIGH]],
         )
+        await agent.run("update config")
 
-        with patch.object(agent, "_plan_changes", new_callable=AsyncMock) as mock_plan:
-            mock_plan.return_value = {
-                "summary": "Test",
-                "changes": [
-                    {
-                        "action": "modify",
-                        "path": "config.py",
-                        "description": "Update config",
-                        "content": "CONFIG='production'",
-                    }
-                ],
-            }
-
-            with patch.object(
-                agent.analyzer,
-                "analyze",
-                new_callable=AsyncMock,
-                return_value=_mock_preview(RiskLevel.HIGH),
-            ):
-                await agent.run("update config")
-
-        with open(export_path) as f:
-            audit_data = json.load(f)
+        audit_data = json_loads(audit_writes[export_path])
 
         # Risk assessment must be recorded
         assert "max_risk_level_seen" in audit_data["summary"]
         assert audit_data["summary"]["max_risk_level_seen"] == "high"
 
-    @pytest.mark.asyncio
     async def test_audit_log_has_approval_records(
-        self, temp_work_dir: Path, monkeypatch: pytest.MonkeyPatch
+        self,
+        compliance_agent: tuple[SafeAgent, Path],
+        make_plan: Callable[..., None],
+        audit_writes: dict[Path, bytes],
     ) -> None:
         """
         Article 12: Must record approval/rejection decisions.
         Critical for demonstrating human oversight.
         """
-        monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
-        export_path = temp_work_dir / "audit.json"
-
-        agent = SafeAgent(
-            working_directory=str(temp_work_dir),
-            non_interactive=True,
-            audit_export_path=str(export_path),
+        agent, export_path = compliance_agent
+        make_plan(
+            agent,
+            [
+                {
+                    "action": "create",
+                    "path": "approved.py",
+                    "description": "Approved",
+                    "content": "x",
+                },
+                {
+                    "action": "delete",
+                    "path": "rejected.py",
+                    "description": "Rejected",
+                },
+            ],
+            previews=[
+                PREVIEWS[RiskLevel.LOW],  # Will be approved
+                PREVIEWS[RiskLevel.CRITICAL],  # Will be rejected
+            ],
+            summary="Mixed",
         )
+        await agent.run("mixed operations")
 
-        with patch.object(agent, "_plan_changes", new_callable=AsyncMock) as mock_plan:
-            mock_plan.return_value = {
-                "summary": "Mixed",
-                "changes": [
-                    {
-                        "action": "create",
-                        "path": "approved.py",
-                        "description": "Approved",
-                        "content": "x",
-                    },
-                    {
-                        "action": "delete",
-                        "path": "rejected.py",
-                        "description": "Rejected",
-                    },
-                ],
-            }
-
-            call_count = 0
-
-            async def mock_analyze(*args, **kwargs):
-                nonlocal call_count
-                call_count += 1
-                if call_count == 1:
-                    return _mock_preview(RiskLevel.LOW)  # Will be approved
-                else:
-                    return _mock_preview(RiskLevel.CRITICAL)  # Will be rejected
-
-            with patch.object(agent.analyzer, "analyze", side_effect=mock_analyze):
-                await agent.run("mixed operations")
-
-        with open(export_path) as f:
-            audit_data = json.load(f)
+        audit_data = json_loads(audit_writes[export_path])
 
         # Must record both approvals and rejections
         assert "changes_approved" in audit_data["summary"]
@@ -252,29 +204,12 @@ class TestArticle12RecordKeeping:
         assert audit_data["summary"]["changes_approved"] == 1
         assert audit_data["summary"]["changes_rejected"] == 1
 
-    @pytest.mark.asyncio
-    async def test_audit_log_completeness_flag_set(
-        self, temp_work_dir: Path, monkeypatch: pytest.MonkeyPatch
-    ) -> None:
+    def test_audit_log_completeness_flag_set(self, empty_run_audit: dict) -> None:
         """
         Article 12: Audit trail must indicate completeness.
         Helps auditors verify no data was lost or corrupted.
         """
-        monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
-        export_path = temp_work_dir / "audit.json"
-
-        agent = SafeAgent(
-            working_directory=str(temp_work_dir),
-            non_interactive=True,
-            audit_export_path=str(export_path),
-        )
-
-        with patch.object(agent, "_plan_changes", new_callable=AsyncMock) as mock_plan:
-            mock_plan.return_value = {"summary": "Test", "changes": []}
-            await agent.run("test")
-
-        with open(export_path) as f:
-            audit_data = json.load(f)
+        audit_data = empty_run_audit
 
         # Completeness flag must be present and true
         assert "compliance_flags" in audit_data
@@ -293,89 +228,58 @@ class TestArticle14HumanOversight:
     Tests verify that operations require approval based on risk level.
     """
 
-    @pytest.mark.asyncio
-    async def test_high_risk_requires_approval_not_auto_executed(
-        self, temp_work_dir: Path, monkeypatch: pytest.MonkeyPatch
+    @pytest.mark.parametrize(
+        ("risk_level", "change"),
+        [
+            pytest.param(
+                RiskLevel.HIGH,
+                {
+                    "action": "delete",
+                    "path": "production_db.sql",
+                    "description": "Delete production database",
+                },
+                id="high",
+            ),
+            pytest.param(
+                RiskLevel.CRITICAL,
+                {
+                    "action": "modify",
+                    "path": ".env",
+                    "description": "Modify credentials",
+                    "content": "API_KEY=secret",
+                },
+                id="critical",
+            ),
+        ],
+    )
+    async def test_high_and_critical_risk_require_approval_not_auto_executed(
+        self,
+        compliance_agent: tuple[SafeAgent, Path],
+        make_plan: Callable[..., None],
+        audit_writes: dict[Path, bytes],
+        risk_level: RiskLevel,
+        change: dict,
     ) -> None:
         """
-        Article 14: HIGH risk operations must require human approval.
-        Cannot be auto-executed without explicit human decision.
+        Article 14: HIGH and CRITICAL risk operations must require human approval.
+        Cannot be auto-executed without explicit human decision, and the rejection
+        is logged in the audit to show oversight is functioning.
         """
-        monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+        agent, export_path = compliance_agent
+        agent.auto_approve_low_risk = True  # Even with auto-approve enabled
 
-        agent = SafeAgent(
-            working_directory=str(temp_work_dir),
-            non_interactive=True,  # Simulates automated environment
-            auto_approve_low_risk=True,  # Even with auto-approve enabled
-        )
+        make_plan(agent, [change], previews=[PREVIEWS[risk_level]], summary="Risky operation")
+        result = await agent.run("risky operation")
 
-        with patch.object(agent, "_plan_changes", new_callable=AsyncMock) as mock_plan:
-            mock_plan.return_value = {
-                "summary": "Risky operation",
-                "changes": [
-                    {
-                        "action": "delete",
-                        "path": "production_db.sql",
-                        "description": "Delete production database",
-                    }
-                ],
-            }
-
-            with patch.object(
-                agent.analyzer,
-                "analyze",
-                new_callable=AsyncMock,
-                return_value=_mock_preview(RiskLevel.HIGH),
-            ):
-                result = await agent.run("delete production db")
-
-        # HIGH risk should be rejected in non-interactive mode
-        # (requires explicit human approval)
+        # Must be rejected in non-interactive mode (requires explicit human approval)
         assert len(result["changes_made"]) == 0
         assert len(result["changes_rejected"]) == 1
 
-    @pytest.mark.asyncio
-    async def test_critical_risk_requires_approval_not_auto_executed(
-        self, temp_work_dir: Path, monkeypatch: pytest.MonkeyPatch
-    ) -> None:
-        """
-        Article 14: CRITICAL risk operations must require human approval.
-        Highest level of oversight required.
-        """
-        monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
-
-        agent = SafeAgent(
-            working_directory=str(temp_work_dir),
-            non_interactive=True,
-            auto_approve_low_risk=True,
-        )
-
-        with patch.object(agent, "_plan_changes", new_callable=AsyncMock) as mock_plan:
-            mock_plan.return_value = {
-                "summary": "Critical operation",
-                "changes": [
-                    {
-                        "action": "modify",
-                        "path": ".env",
-                        "description": "Modify credentials",
-                        "content": "API_KEY=secret",
-                    }
-                ],
-            }
-
-            with patch.object(
-                agent.analyzer,
-                "analyze",
-                new_callable=AsyncMock,
-                return_value=_mock_preview(RiskLevel.CRITICAL),
-            ):
-                result = await agent.run("update credentials")
+        audit_data = json_loads(audit_writes[export_path])
 
-        # CRITICAL risk must be rejected in non-interactive
-        assert len(result["changes_made"]) == 0
-        assert len(result["changes_rejected"]) == 1
+        assert audit_data["summary"]["changes_rejected"] == 1
+        assert audit_data["summary"]["changes_approved"] == 0
 
-    @pytest.mark.asyncio
     async def test_dry_run_mode_shows_preview_without_execution(
         self, temp_work_dir: Path, monkeypatch: pytest.MonkeyPatch
     ) -> None:
@@ -383,7 +287,6 @@ class TestArticle14HumanOversight:
         Article 14: Dry-run mode enables preview without execution.
         Allows operators to assess impact before approval.
         """
-        monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
         export_path = temp_work_dir / "audit.json"
 
         agent = SafeAgent(
@@ -393,93 +296,38 @@ class TestArticle14HumanOversight:
             audit_export_path=str(export_path),
         )
 
-        with patch.object(agent, "_plan_changes", new_callable=AsyncMock) as mock_plan:
-            mock_plan.return_value = {
-                "summary": "Test change",
-                "changes": [
-                    {
-                        "action": "create",
-                        "path": "test.py",
-                        "description": "Create file",
-                        "content": "print('hello')",
-                    }
-                ],
-            }
-
-            with patch.object(
-                agent.analyzer,
-                "analyze",
-                new_callable=AsyncMock,
-                return_value=_mock_preview(RiskLevel.LOW),
-            ):
-                result = await agent.run("create test file")
+        plan = {
+            "summary": "Test change",
+            "changes": [
+                {
+                    "action": "create",
+                    "path": "test.py",
+                    "description": "Create file",
+                    "content": "print('hello')",
+                }
+            ],
+        }
+        monkeypatch.setattr(agent, "_plan_changes", async_return(plan))
+
+        monkeypatch.setattr(agent.analyzer, "analyze", async_return(PREVIEWS[RiskLevel.LOW]))
+        result = await agent.run("create test file")
 
         # Dry run: nothing executed
         assert result["changes_made"] == []
         assert not (temp_work_dir / "test.py").exists()
 
         # But audit still records the preview
-        with open(export_path) as f:
-            audit_data = json.load(f)
+        audit_data = json_loads(export_path.read_bytes())
 
         assert audit_data["summary"]["changes_executed"] == 0
 
-    @pytest.mark.asyncio
-    async def test_rejected_operations_logged_in_audit(
-        self, temp_work_dir: Path, monkeypatch: pytest.MonkeyPatch
-    ) -> None:
-        """
-        Article 14: Rejected operations must be logged.
-        Demonstrates oversight is functioning.
-        """
-        monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
-        export_path = temp_work_dir / "audit.json"
-
-        agent = SafeAgent(
-            working_directory=str(temp_work_dir),
-            non_interactive=True,
-            audit_export_path=str(export_path),
-        )
-
-        with patch.object(agent, "_plan_changes", new_callable=AsyncMock) as mock_plan:
-            mock_plan.return_value = {
-                "summary": "Dangerous",
-                "changes": [
-                    {
-                        "action": "delete",
-                        "path": "critical_data.sql",
-                        "description": "Delete critical data",
-                    }
-                ],
-            }
-
-            with patch.object(
-                agent.analyzer,
-                "analyze",
-                new_callable=AsyncMock,
-                return_value=_mock_preview(RiskLevel.CRITICAL),
-            ):
-                result = await agent.run("delete data")
-
-        # Verify rejection recorded
-        assert len(result["changes_rejected"]) == 1
-
-        with open(export_path) as f:
-            audit_data = json.load(f)
-
-        assert audit_data["summary"]["changes_rejected"] == 1
-        assert audit_data["summary"]["changes_approved"] == 0
-
-    @pytest.mark.asyncio
     async def test_compliance_mode_forces_approval_for_all_levels(
-        self, temp_work_dir: Path, monkeypatch: pytest.MonkeyPatch
+        self, temp_work_dir: Path
     ) -> None:
         """
         Article 14: Compliance mode enforces strictest oversight.
         ALL changes require approval, even LOW risk.
         """
-        monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
-
         agent = SafeAgent(
             working_directory=str(temp_work_dir),
             auto_approve_low_risk=True,  # Normally would auto-approve
@@ -490,7 +338,6 @@ class TestArticle14HumanOversight:
         assert agent.compliance_mode is True
         assert agent.auto_approve_low_risk is False
 
-    @pytest.mark.asyncio
     async def test_low_risk_auto_approved_without_compliance_mode(
         self, temp_work_dir: Path, monkeypatch: pytest.MonkeyPatch
     ) -> None:
@@ -498,8 +345,6 @@ class TestArticle14HumanOversight:
         Article 14: Without compliance mode, LOW risk can be auto-approved.
         This is the normal operating mode for non-regulated environments.
         """
-        monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
-
         agent = SafeAgent(
             working_directory=str(temp_work_dir),
             auto_approve_low_risk=True,
@@ -508,26 +353,21 @@ class TestArticle14HumanOversight:
         )
 
         # Mock the preview_and_approve method
-        with patch.object(agent, "_plan_changes", new_callable=AsyncMock) as mock_plan:
-            mock_plan.return_value = {
-                "summary": "Safe change",
-                "changes": [
-                    {
-                        "action": "create",
-                        "path": "docs/readme.md",
-                        "description": "Add docs",
-                        "content": "# Docs",
-                    }
-                ],
-            }
-
-            with patch.object(
-                agent.analyzer,
-                "analyze",
-                new_callable=AsyncMock,
-                return_value=_mock_preview(RiskLevel.LOW),
-            ):
-                result = await agent.run("add documentation")
+        plan = {
+            "summary": "Safe change",
+            "changes": [
+                {
+                    "action": "create",
+                    "path": "docs/readme.md",
+                    "description": "Add docs",
+                    "content": "# Docs",
+                }
+            ],
+        }
+        monkeypatch.setattr(agent, "_plan_changes", async_return(plan))
+
+        monkeypatch.setattr(agent.analyzer, "analyze", async_return(PREVIEWS[RiskLevel.LOW]))
+        result = await agent.run("add documentation")
 
         # LOW risk should be auto-approved
         assert len(result["changes_made"]) == 1
@@ -539,39 +379,33 @@ class TestArticle14HumanOversight:
 # =============================================================================
 
 
+_DANGEROUS_PATHS = (
+    "../../../etc/passwd",
+    "../../.ssh/id_rsa",
+    "foo/../../../secret",
+    "/etc/passwd",
+    "C:\\Windows\\System32\\config",
+)
+_SAFE_PATHS = ("foo.py", "src/agent.py", "./config.yaml", "docs/guide.md", "sub/dir/file.txt")
+
+
 class TestArticle15AccuracyRobustnessCybersecurity:
     """
     Article 15 requires appropriate accuracy, robustness, and security.
     Tests verify path safety, error handling, and resilience.
     """
 
+    @pytest.mark.parametrize("dangerous_path", _DANGEROUS_PATHS)
     def test_path_safety_prevents_directory_traversal(
-        self, temp_work_dir: Path, monkeypatch: pytest.MonkeyPatch
+        self, safe_agent: SafeAgent, dangerous_path: str
     ) -> None:
         """
         Article 15: Must prevent directory traversal attacks.
         Critical cybersecurity measure.
         """
-        monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
-
-        agent = SafeAgent(working_directory=str(temp_work_dir))
-
-        # Test various traversal attempts
-        dangerous_paths = [
-            "../../../etc/passwd",
-            "../../.ssh/id_rsa",
-            "foo/../../../secret",
-            "/etc/passwd",
-            "C:\\Windows\\System32\\config",
-        ]
-
-        for dangerous_path in dangerous_paths:
-            resolved = agent._resolve_path_safe(dangerous_path)
-            assert (
-                resolved is None
-            ), f"Path traversal should be blocked: {dangerous_path}"
-
-    @pytest.mark.asyncio
+        resolved = safe_agent._resolve_path_safe(dangerous_path)
+        assert resolved is None, f"Path traversal should be blocked: {dangerous_path}"
+
     async def test_unsafe_path_rejected_at_preview_stage(
         self, temp_work_dir: Path, monkeypatch: pytest.MonkeyPatch
     ) -> None:
@@ -579,32 +413,29 @@ class TestArticle15AccuracyRobustnessCybersecurity:
         Article 15: Unsafe operations must be rejected before execution.
         Defense in depth - multiple layers of protection.
         """
-        monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
-
         agent = SafeAgent(
             working_directory=str(temp_work_dir),
             non_interactive=True,
         )
 
-        with patch.object(agent, "_plan_changes", new_callable=AsyncMock) as mock_plan:
-            mock_plan.return_value = {
-                "summary": "Attack attempt",
-                "changes": [
-                    {
-                        "action": "delete",
-                        "path": "../../../etc/passwd",
-                        "description": "Malicious",
-                    }
-                ],
-            }
+        plan = {
+            "summary": "Attack attempt",
+            "changes": [
+                {
+                    "action": "delete",
+                    "path": "../../../etc/passwd",
+                    "description": "Malicious",
+                }
+            ],
+        }
+        monkeypatch.setattr(agent, "_plan_changes", async_return(plan))
 
-            result = await agent.run("attack")
+        result = await agent.run("attack")
 
         # Unsafe path should be rejected
         assert len(result["changes_made"]) == 0
         assert result["max_risk_level_seen"] == "critical"
 
-    @pytest.mark.asyncio
     async def test_error_handling_does_not_crash_agent(
         self, temp_work_dir: Path, monkeypatch: pytest.MonkeyPatch
     ) -> None:
@@ -612,24 +443,18 @@ class TestArticle15AccuracyRobustnessCybersecurity:
         Article 15: System must handle errors gracefully (robustness).
         Failures should not crash the agent.
         """
-        monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
-
         agent = SafeAgent(
             working_directory=str(temp_work_dir),
             non_interactive=True,
         )
 
         # Mock _plan_changes to raise an exception
-        with patch.object(agent, "_plan_changes", new_callable=AsyncMock) as mock_plan:
-            mock_plan.side_effect = Exception("API Error")
+        monkeypatch.setattr(agent, "_plan_changes", AsyncMock(side_effect=Exception("API Error")))
 
-            # Should not crash, should handle gracefully
-            with pytest.raises(Exception) as exc_info:
-                await agent.run("test task")
-
-            assert "API Error" in str(exc_info.value)
+        # Should not crash, should handle gracefully
+        with pytest.raises(Exception, match="API Error"):
+            await agent.run("test task")
 
-    @pytest.mark.asyncio
     async def test_audit_export_works_even_when_operations_fail(
         self, temp_work_dir: Path, monkeypatch: pytest.MonkeyPatch
     ) -> None:
@@ -637,7 +462,6 @@ class TestArticle15AccuracyRobustnessCybersecurity:
         Article 15: Audit logging must be resilient.
         Even if operations fail, audit trail can be manually exported.
         """
-        monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
         export_path = temp_work_dir / "audit.json"
 
         agent = SafeAgent(
@@ -646,39 +470,34 @@ class TestArticle15AccuracyRobustnessCybersecurity:
             audit_export_path=str(export_path),
         )
 
-        with patch.object(agent, "_plan_changes", new_callable=AsyncMock) as mock_plan:
-            mock_plan.return_value = {
-                "summary": "Operation that will fail",
-                "changes": [
-                    {
-                        "action": "create",
-                        "path": "test.py",
-                        "description": "Test",
-                        "content": "test",
-                    }
-                ],
-            }
-
-            # Mock _execute_change to fail
-            original_execute = agent._execute_change
-
-            def failing_execute(change):
-                raise OSError("Disk full")
-
-            agent._execute_change = failing_execute
-
-            with patch.object(
-                agent.analyzer,
-                "analyze",
-                new_callable=AsyncMock,
-                return_value=_mock_preview(RiskLevel.LOW),
-            ):
-                # This will fail during execution - expect the error
-                with pytest.raises(OSError, match="Disk full"):
-                    await agent.run("test")
+        plan = {
+            "summary": "Operation that will fail",
+            "changes": [
+                {
+                    "action": "create",
+                    "path": "test.py",
+                    "description": "Test",
+                    "content": "test",
+                }
+            ],
+        }
+        monkeypatch.setattr(agent, "_plan_changes", async_return(plan))
+
+        # Mock _execute_change to fail
+        original_execute = agent._execute_change
+
+        def failing_execute(change):
+            raise OSError("Disk full")
+
+        agent._execute_change = failing_execute
+
+        monkeypatch.setattr(agent.analyzer, "analyze", async_return(PREVIEWS[RiskLevel.LOW]))
+        # This will fail during execution - expect the error
+        with pytest.raises(OSError, match="Disk full"):
+            await agent.run("test")
 
-            # Restore original
-            agent._execute_change = original_execute
+        # Restore original
+        agent._execute_change = original_execute
 
         # Manually finalize and export audit trail after error
         agent._finalize_audit_trail("test")
@@ -687,39 +506,22 @@ class TestArticle15AccuracyRobustnessCybersecurity:
         # Audit should be exported after manual call
         assert export_path.exists()
 
-        with open(export_path) as f:
-            audit_data = json.load(f)
+        audit_data = json_loads(export_path.read_bytes())
 
         # Audit should be complete (tracks what happened before failure)
         assert audit_data["compliance_flags"]["audit_trail_complete"] is True
 
-    @pytest.mark.asyncio
-    async def test_path_safety_allows_safe_paths(
-        self, temp_work_dir: Path, monkeypatch: pytest.MonkeyPatch
+    @pytest.mark.parametrize("safe_path", _SAFE_PATHS)
+    def test_path_safety_allows_safe_paths(
+        self, safe_agent: SafeAgent, safe_path: str
     ) -> None:
         """
         Article 15: Security measures must not block legitimate operations.
         Balance between security and usability (accuracy).
         """
-        monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
-
-        agent = SafeAgent(working_directory=str(temp_work_dir))
-
-        # Test safe paths that should be allowed
-        safe_paths = [
-            "foo.py",
-            "src/agent.py",
-            "./config.yaml",
-            "docs/guide.md",
-            "sub/dir/file.txt",
-        ]
-
-        for safe_path in safe_paths:
-            resolved = agent._resolve_path_safe(safe_path)
-            assert (
-                resolved is not None
-            ), f"Safe path should be allowed: {safe_path}"
-            assert str(resolved).startswith(str(temp_work_dir))
+        resolved = safe_agent._resolve_path_safe(safe_path)
+        assert resolved is not None, f"Safe path should be allowed: {safe_path}"
+        assert resolved.is_relative_to(safe_agent.working_directory)
 
 
 # =============================================================================
@@ -733,15 +535,11 @@ class TestComplianceModeDocumentation:
     Based on docs/eu-ai-act-compliance.md specifications.
     """
 
-    def test_compliance_mode_disables_auto_approve(
-        self, temp_work_dir: Path, monkeypatch: pytest.MonkeyPatch
-    ) -> None:
+    def test_compliance_mode_disables_auto_approve(self, temp_work_dir: Path) -> None:
         """
         Documented: Compliance mode disables --auto-approve-low.
         Verify this is enforced at initialization.
         """
-        monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
-
         # Try to enable both
         agent = SafeAgent(
             working_directory=str(temp_work_dir),
@@ -753,58 +551,42 @@ class TestComplianceModeDocumentation:
         assert agent.compliance_mode is True
         assert agent.auto_approve_low_risk is False
 
-    @pytest.mark.asyncio
     async def test_compliance_mode_recorded_in_audit_metadata(
-        self, temp_work_dir: Path, monkeypatch: pytest.MonkeyPatch
+        self, temp_work_dir: Path, empty_plan: None
     ) -> None:
         """
         Documented: Compliance mode is recorded in audit metadata.
         Verify this appears in exported audit JSON.
         """
-        monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
-        export_path = temp_work_dir / "audit.json"
-
         agent = SafeAgent(
             working_directory=str(temp_work_dir),
             non_interactive=True,
-            audit_export_path=str(export_path),
             compliance_mode=True,
         )
 
-        with patch.object(agent, "_plan_changes", new_callable=AsyncMock) as mock_plan:
-            mock_plan.return_value = {"summary": "Test", "changes": []}
-            await agent.run("test")
+        await agent.run("test")
 
-        with open(export_path) as f:
-            audit_data = json.load(f)
+        audit_data = agent.build_audit_export()
 
         # Must be in audit_metadata
         assert audit_data["audit_metadata"]["compliance_mode"] is True
 
-    @pytest.mark.asyncio
     async def test_compliance_flags_section_present(
-        self, temp_work_dir: Path, monkeypatch: pytest.MonkeyPatch
+        self, temp_work_dir: Path, empty_plan: None
     ) -> None:
         """
         Documented: Audit export includes compliance_flags section.
         Verify all required flags are present.
         """
-        monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
-        export_path = temp_work_dir / "audit.json"
-
         agent = SafeAgent(
             working_directory=str(temp_work_dir),
             non_interactive=True,
-            audit_export_path=str(export_path),
             compliance_mode=True,
         )
 
-        with patch.object(agent, "_plan_changes", new_callable=AsyncMock) as mock_plan:
-            mock_plan.return_value = {"summary": "Test", "changes": []}
-            await agent.run("test")
+        await agent.run("test")
 
-        with open(export_path) as f:
-            audit_data = json.load(f)
+        audit_data = agent.build_audit_export()
 
         # Compliance flags section must exist
         assert "compliance_flags" in audit_data
@@ -818,34 +600,14 @@ class TestComplianceModeDocumentation:
         # In this test, compliance mode was enabled
         assert flags["compliance_mode_enabled"] is True
 
-    @pytest.mark.asyncio
-    async def test_compliance_mode_false_recorded_correctly(
-        self, temp_work_dir: Path, monkeypatch: pytest.MonkeyPatch
-    ) -> None:
+    def test_compliance_mode_false_recorded_correctly(self, baseline_audit: dict) -> None:
         """
         When compliance mode is NOT enabled, this should also be recorded.
         Ensures auditors can verify mode setting.
         """
-        monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
-        export_path = temp_work_dir / "audit.json"
-
-        agent = SafeAgent(
-            working_directory=str(temp_work_dir),
-            non_interactive=True,
-            audit_export_path=str(export_path),
-            compliance_mode=False,  # Explicitly not in compliance mode
-        )
-
-        with patch.object(agent, "_plan_changes", new_callable=AsyncMock) as mock_plan:
-            mock_plan.return_value = {"summary": "Test", "changes": []}
-            await agent.run("test")
-
-        with open(export_path) as f:
-            audit_data = json.load(f)
-
         # Should record False, not just omit
-        assert audit_data["audit_metadata"]["compliance_mode"] is False
-        assert audit_data["compliance_flags"]["compliance_mode_enabled"] is False
+        assert baseline_audit["audit_metadata"]["compliance_mode"] is False
+        assert baseline_audit["compliance_flags"]["compliance_mode_enabled"] is False
 
 
 # =============================================================================
@@ -859,220 +621,89 @@ class TestAuditExportSchemaCompliance:
     Based on docs/eu-ai-act-compliance.md Article 12 section.
     """
 
-    @pytest.mark.asyncio
-    async def test_audit_export_has_all_required_sections(
-        self, temp_work_dir: Path, monkeypatch: pytest.MonkeyPatch
-    ) -> None:
+    def test_audit_export_has_all_required_sections(self, baseline_audit: dict) -> None:
         """
         Documented schema requires 4 top-level sections:
         audit_metadata, task, changes, summary
         """
-        monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
-        export_path = temp_work_dir / "audit.json"
-
-        agent = SafeAgent(
-            working_directory=str(temp_work_dir),
-            non_interactive=True,
-            audit_export_path=str(export_path),
-        )
-
-        with patch.object(agent, "_plan_changes", new_callable=AsyncMock) as mock_plan:
-            mock_plan.return_value = {"summary": "Test", "changes": []}
-            await agent.run("test")
-
-        with open(export_path) as f:
-            audit_data = json.load(f)
-
-        # All required top-level sections
-        assert "audit_metadata" in audit_data
-        assert "task" in audit_data
-        assert "changes" in audit_data
-        assert "summary" in audit_data
-
-    @pytest.mark.asyncio
-    async def test_audit_metadata_section_complete(
-        self, temp_work_dir: Path, monkeypatch: pytest.MonkeyPatch
+        for section in ("audit_metadata", "task", "changes", "summary"):
+            assert section in baseline_audit
+
+    @pytest.mark.parametrize(
+        ("section", "required_keys"),
+        [
+            pytest.param(
+                "audit_metadata",
+                ["export_version", "export_timestamp", "agent_version", "compliance_mode"],
+                id="audit_metadata",
+            ),
+            pytest.param(
+                "task",
+                [
+                    "task_description",
+                    "requested_at",
+                    "requested_by",
+                    "working_directory",
+                    "model_used",
+                ],
+                id="task",
+            ),
+            pytest.param(
+                "summary",
+                [
+                    "total_changes_planned",
+                    "changes_approved",
+                    "changes_rejected",
+                    "changes_executed",
+                    "max_risk_level_seen",
+                    "policy_violations",
+                    "duration_seconds",
+                ],
+                id="summary",
+            ),
+            pytest.param(
+                "compliance_flags",
+                [
+                    "compliance_mode_enabled",
+                    "all_high_risk_approved",
+                    "policy_file_present",
+                    "audit_trail_complete",
+                ],
+                id="compliance_flags",
+            ),
+        ],
+    )
+    def test_audit_section_complete(
+        self, baseline_audit: dict, section: str, required_keys: list[str]
     ) -> None:
-        """
-        Audit metadata must include: export_version, export_timestamp,
-        agent_version, compliance_mode
-        """
-        monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
-        export_path = temp_work_dir / "audit.json"
+        """Each documented section must carry all of its documented fields."""
+        missing = [key for key in required_keys if key not in baseline_audit[section]]
+        assert not missing, f"{section} is missing {missing}"
 
-        agent = SafeAgent(
-            working_directory=str(temp_work_dir),
-            non_interactive=True,
-            audit_export_path=str(export_path),
-        )
-
-        with patch.object(agent, "_plan_changes", new_callable=AsyncMock) as mock_plan:
-            mock_plan.return_value = {"summary": "Test", "changes": []}
-            await agent.run("test")
-
-        with open(export_path) as f:
-            audit_data = json.load(f)
-
-        metadata = audit_data["audit_metadata"]
-        assert "export_version" in metadata
+    def test_audit_metadata_identifies_export_and_agent(self, baseline_audit: dict) -> None:
+        """Audit metadata pins the export schema version and names the producing agent."""
+        metadata = baseline_audit["audit_metadata"]
         assert metadata["export_version"] == "1.0"
-        assert "export_timestamp" in metadata
-        assert "agent_version" in metadata
         assert "safe-agent" in metadata["agent_version"]
-        assert "compliance_mode" in metadata
-
-    @pytest.mark.asyncio
-    async def test_task_section_complete(
-        self, temp_work_dir: Path, monkeypatch: pytest.MonkeyPatch
-    ) -> None:
-        """
-        Task section must include: task_description, requested_at,
-        requested_by, working_directory, model_used
-        """
-        monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
-        export_path = temp_work_dir / "audit.json"
-
-        agent = SafeAgent(
-            working_directory=str(temp_work_dir),
-            non_interactive=True,
-            audit_export_path=str(export_path),
-        )
-
-        with patch.object(agent, "_plan_changes", new_callable=AsyncMock) as mock_plan:
-            mock_plan.return_value = {"summary": "Test", "changes": []}
-            await agent.run("test task")
-
-        with open(export_path) as f:
-            audit_data = json.load(f)
-
-        task = audit_data["task"]
-        assert "task_description" in task
-        assert "requested_at" in task
-        assert "requested_by" in task
-        assert "working_directory" in task
-        assert "model_used" in task
-
-    @pytest.mark.asyncio
-    async def test_summary_section_complete(
-        self, temp_work_dir: Path, monkeypatch: pytest.MonkeyPatch
-    ) -> None:
-        """
-        Summary must include: total_changes_planned, changes_approved,
-        changes_rejected, changes_executed, max_risk_level_seen,
-        policy_violations, duration_seconds
-        """
-        monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
-        export_path = temp_work_dir / "audit.json"
 
-        agent = SafeAgent(
-            working_directory=str(temp_work_dir),
-            non_interactive=True,
-            audit_export_path=str(export_path),
-        )
-
-        with patch.object(agent, "_plan_changes", new_callable=AsyncMock) as mock_plan:
-            mock_plan.return_value = {"summary": "Test", "changes": []}
-            await agent.run("test")
-
-        with open(export_path) as f:
-            audit_data = json.load(f)
-
-        summary = audit_data["summary"]
-        assert "total_changes_planned" in summary
-        assert "changes_approved" in summary
-        assert "changes_rejected" in summary
-        assert "changes_executed" in summary
-        assert "max_risk_level_seen" in summary
-        assert "policy_violations" in summary
-        assert "duration_seconds" in summary
+    def test_compliance_flags_are_booleans(self, baseline_audit: dict) -> None:
+        """Compliance flags must be plain true/false values."""
+        for flag, value in baseline_audit["compliance_flags"].items():
+            assert isinstance(value, bool), flag
 
-    @pytest.mark.asyncio
-    async def test_audit_export_is_valid_json(
-        self, temp_work_dir: Path, monkeypatch: pytest.MonkeyPatch
-    ) -> None:
+    def test_audit_export_is_valid_json(self, baseline_audit: dict) -> None:
         """
         Audit export must be valid, parseable JSON.
         Required for long-term retention and automated processing.
         """
-        monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
-        export_path = temp_work_dir / "audit.json"
-
-        agent = SafeAgent(
-            working_directory=str(temp_work_dir),
-            non_interactive=True,
-            audit_export_path=str(export_path),
-        )
+        # baseline_audit is the export parsed from disk
+        assert isinstance(baseline_audit, dict)
 
-        with patch.object(agent, "_plan_changes", new_callable=AsyncMock) as mock_plan:
-            mock_plan.return_value = {"summary": "Test", "changes": []}
-            await agent.run("test")
-
-        # Should parse without error
-        with open(export_path) as f:
-            audit_data = json.load(f)
-
-        assert isinstance(audit_data, dict)
-
-    @pytest.mark.asyncio
-    async def test_audit_export_is_pretty_printed(
-        self, temp_work_dir: Path, monkeypatch: pytest.MonkeyPatch
-    ) -> None:
+    def test_audit_export_is_pretty_printed(self, baseline_export: bytes) -> None:
         """
         Audit export should be pretty-printed (indented) for human readability.
         Important for manual audits and regulatory inspection.
         """
-        monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
-        export_path = temp_work_dir / "audit.json"
-
-        agent = SafeAgent(
-            working_directory=str(temp_work_dir),
-            non_interactive=True,
-            audit_export_path=str(export_path),
-        )
-
-        with patch.object(agent, "_plan_changes", new_callable=AsyncMock) as mock_plan:
-            mock_plan.return_value = {"summary": "Test", "changes": []}
-            await agent.run("test")
-
-        # Read raw content
-        with open(export_path) as f:
-            content = f.read()
-
         # Pretty-printed JSON has newlines and indentation
-        assert "\n" in content
-        assert "  " in content  # Indentation present
-
-    @pytest.mark.asyncio
-    async def test_compliance_flags_all_present(
-        self, temp_work_dir: Path, monkeypatch: pytest.MonkeyPatch
-    ) -> None:
-        """
-        Compliance flags must include all documented fields.
-        """
-        monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
-        export_path = temp_work_dir / "audit.json"
-
-        agent = SafeAgent(
-            working_directory=str(temp_work_dir),
-            non_interactive=True,
-            audit_export_path=str(export_path),
-        )
-
-        with patch.object(agent, "_plan_changes", new_callable=AsyncMock) as mock_plan:
-            mock_plan.return_value = {"summary": "Test", "changes": []}
-            await agent.run("test")
-
-        with open(export_path) as f:
-            audit_data = json.load(f)
-
-        flags = audit_data["compliance_flags"]
-        required_flags = [
-            "compliance_mode_enabled",
-            "all_high_risk_approved",
-            "policy_file_present",
-            "audit_trail_complete",
-        ]
-
-        for flag in required_flags:
-            assert flag in flags
-            assert isinstance(flags[flag], bool)
+        assert b"\n" in baseline_export
+        assert b"  " in baseline_export  # Indentation present
@@ -4,192 +4,87 @@ from __future__ import annotations
 
 import json
 from pathlib import Path
-from unittest.mock import AsyncMock, patch
+from unittest.mock import Mock
 
 import pytest
-
 from agent_polis.actions.models import RiskLevel
+from helpers import ACTION, PREVIEWS, async_return
 
 from safe_agent.agent import SafeAgent
 
 
-def _mock_preview(level: RiskLevel) -> object:
-    return type(
-        "Preview",
-        (),
-        {
-            "risk_level": level,
-            "risk_factors": [],
-            "file_changes": [],
-        },
-    )()
-
-
-def _write_policy(base_dir: Path, policy: dict) -> Path:
-    path = base_dir / "policy.json"
-    path.write_text(json.dumps(policy), encoding="utf-8")
-    return path
-
-
-@pytest.mark.asyncio
-async def test_policy_deny_blocks_without_prompt(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
-    monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
-    workdir = tmp_path / "repo"
-    workdir.mkdir(parents=True, exist_ok=True)
-
-    policy_path = _write_policy(
-        workdir,
-        {
-            "version": "test-1",
-            "defaults": {"decision": "require_approval"},
-            "rules": [
-                {
-                    "id": "deny-foo",
-                    "decision": "deny",
-                    "priority": 0,
-                    "path_globs": ["*foo.py"],
-                }
-            ],
-        },
-    )
-
-    agent = SafeAgent(
-        working_directory=str(workdir),
-        non_interactive=False,
-        policy_path=str(policy_path),
-    )
-
-    with patch.object(
-        agent.analyzer,
-        "analyze",
-        new_callable=AsyncMock,
-        return_value=_mock_preview(RiskLevel.LOW),
-    ):
-        with patch("safe_agent.agent.Confirm.ask", return_value=True) as confirm:
-            approved = await agent._preview_and_approve(
-                {"action": "modify", "path": "foo.py", "description": "x", "content": "x"}
-            )
-
-    assert approved is False
-    assert agent.governance_policy_failed is True
-    assert agent.governance_policy_reason == "deny-foo"
-    confirm.assert_not_called()
-
-
-@pytest.mark.asyncio
-async def test_policy_require_approval_prompts_in_interactive(
-    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+def _rule(rule_id: str, decision: str) -> dict:
+    return {"id": rule_id, "decision": decision, "priority": 0, "path_globs": ["*foo.py"]}
+
+
+_POLICY_RULES = {
+    "deny": [_rule("deny-foo", "deny")],
+    "require_approval": [],
+    "allow": [_rule("allow-foo", "allow")],
+}
+
+
+@pytest.fixture(scope="module")
+def policy_dir(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Working directory holding one ``<name>.json`` per entry in ``_POLICY_RULES``."""
+    base_dir = tmp_path_factory.mktemp("policies").resolve()
+    for name, rules in _POLICY_RULES.items():
+        policy = {"version": "test-1", "defaults": {"decision": "require_approval"}, "rules": rules}
+        (base_dir / f"{name}.json").write_text(json.dumps(policy), encoding="utf-8")
+    return base_dir
+
+
+@pytest.mark.parametrize(
+    (
+        "policy",
+        "non_interactive",
+        "risk_level",
+        "expected_approved",
+        "expected_reason",
+        "expected_prompts",
+    ),
+    [
+        pytest.param(
+            "deny", False, RiskLevel.LOW, False, "deny-foo", 0,
+            id="deny-blocks-without-prompt",
+        ),
+        pytest.param(
+            "require_approval", False, RiskLevel.LOW, True, None, 1,
+            id="require-approval-prompts-in-interactive",
+        ),
+        pytest.param(
+            "require_approval", True, RiskLevel.LOW, False, None, 0,
+            id="require-approval-rejects-in-non-interactive",
+        ),
+        pytest.param(
+            "allow", True, RiskLevel.HIGH, True, None, 0,
+            id="allow-auto-approves-in-non-interactive",
+        ),
+    ],
+)
+async def test_policy_decision(
+    policy_dir: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    policy: str,
+    non_interactive: bool,
+    risk_level: RiskLevel,
+    expected_approved: bool,
+    expected_reason: str | None,
+    expected_prompts: int,
 ) -> None:
-    monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
-    workdir = tmp_path / "repo"
-    workdir.mkdir(parents=True, exist_ok=True)
-
-    policy_path = _write_policy(
-        workdir,
-        {
-            "version": "test-1",
-            "defaults": {"decision": "require_approval"},
-            "rules": [],
-        },
-    )
-
-    agent = SafeAgent(
-        working_directory=str(workdir),
-        non_interactive=False,
-        policy_path=str(policy_path),
-    )
-
-    with patch.object(
-        agent.analyzer,
-        "analyze",
-        new_callable=AsyncMock,
-        return_value=_mock_preview(RiskLevel.LOW),
-    ):
-        with patch("safe_agent.agent.Confirm.ask", return_value=True) as confirm:
-            approved = await agent._preview_and_approve(
-                {"action": "modify", "path": "foo.py", "description": "x", "content": "x"}
-            )
-
-    assert approved is True
-    assert agent.governance_policy_failed is False
-    confirm.assert_called_once()
-
-
-@pytest.mark.asyncio
-async def test_policy_require_approval_rejects_in_non_interactive(
-    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
-) -> None:
-    monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
-    workdir = tmp_path / "repo"
-    workdir.mkdir(parents=True, exist_ok=True)
-
-    policy_path = _write_policy(
-        workdir,
-        {
-            "version": "test-1",
-            "defaults": {"decision": "require_approval"},
-            "rules": [],
-        },
-    )
-
-    agent = SafeAgent(
-        working_directory=str(workdir),
-        non_interactive=True,
-        policy_path=str(policy_path),
-    )
-
-    with patch.object(
-        agent.analyzer,
-        "analyze",
-        new_callable=AsyncMock,
-        return_value=_mock_preview(RiskLevel.LOW),
-    ):
-        approved = await agent._preview_and_approve(
-            {"action": "modify", "path": "foo.py", "description": "x", "content": "x"}
-        )
-
-    assert approved is False
-    assert agent.governance_policy_failed is False
-
-
-@pytest.mark.asyncio
-async def test_policy_allow_auto_approves_in_non_interactive(
-    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
-) -> None:
-    monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
-    workdir = tmp_path / "repo"
-    workdir.mkdir(parents=True, exist_ok=True)
-
-    policy_path = _write_policy(
-        workdir,
-        {
-            "version": "test-1",
-            "defaults": {"decision": "require_approval"},
-            "rules": [
-                {
-                    "id": "allow-foo",
-                    "decision": "allow",
-                    "priority": 0,
-                    "path_globs": ["*foo.py"],
-                }
-            ],
-        },
-    )
-
+    """Policy-as-code decisions gate approval ahead of the risk-level defaults."""
     agent = SafeAgent(
-        working_directory=str(workdir),
-        non_interactive=True,
-        policy_path=str(policy_path),
+        working_directory=str(policy_dir),
+        non_interactive=non_interactive,
+        policy_path=f"{policy}.json",
     )
+    monkeypatch.setattr(agent.analyzer, "analyze", async_return(PREVIEWS[risk_level]))
+    confirm = Mock(return_value=True)
+    monkeypatch.setattr("safe_agent.agent.Confirm.ask", confirm)
 
-    with patch.object(
-        agent.analyzer,
-        "analyze",
-        new_callable=AsyncMock,
-        return_value=_mock_preview(RiskLevel.HIGH),
-    ):
-        approved = await agent._preview_and_approve(
-            {"action": "modify", "path": "foo.py", "description": "x", "content": "x"}
-        )
+    approved = await agent._preview_and_approve(ACTION)
 
-    assert approved is True
+    assert approved is expected_approved
+    assert agent.governance_policy_failed is (expected_reason is not None)
+    assert agent.governance_policy_reason == expected_reason
+    assert confirm.call_count == expected_prompts
@@ -4,6 +4,8 @@ from __future__ import annotations
 
 from pathlib import Path
 
+import pytest
+
 from safe_agent.agent import SafeAgent
 
 
@@ -17,14 +19,19 @@ def test_resolve_path_safe_rejects_absolute_paths(safe_agent: SafeAgent) -> None
     assert safe_agent._resolve_path_safe("/etc/passwd") is None
 
 
-def test_resolve_path_safe_rejects_traversal(safe_agent: SafeAgent) -> None:
-    assert safe_agent._resolve_path_safe("../etc/passwd") is None
-    assert safe_agent._resolve_path_safe("foo/../../bar") is None
+@pytest.mark.parametrize("path", ["../etc/passwd", "foo/../../bar"])
+def test_resolve_path_safe_rejects_traversal(safe_agent: SafeAgent, path: str) -> None:
+    assert safe_agent._resolve_path_safe(path) is None
 
 
-def test_resolve_path_safe_rejects_windows_absolute(safe_agent: SafeAgent) -> None:
-    assert safe_agent._resolve_path_safe("C:\\Windows\\System32\\drivers\\etc\\hosts") is None
-    assert safe_agent._resolve_path_safe("\\\\server\\share\\file.txt") is None
+@pytest.mark.parametrize(
+    "path",
+    ["C:\\Windows\\System32\\drivers\\etc\\hosts", "\\\\server\\share\\file.txt"],
+)
+def test_resolve_path_safe_rejects_windows_absolute(
+    safe_agent: SafeAgent, path: str
+) -> None:
+    assert safe_agent._resolve_path_safe(path) is None
 
 
 def test_resolve_path_safe_rejects_home_expansion(safe_agent: SafeAgent) -> None:
@@ -2,89 +2,84 @@
 
 from __future__ import annotations
 
-from unittest.mock import AsyncMock, patch
-
 import pytest
-
 from agent_polis.actions.models import RiskLevel
+from helpers import ACTION, PREVIEWS, async_return
 
 from safe_agent.agent import SafeAgent
 
-
-def _mock_preview(level: RiskLevel) -> object:
-    return type("Preview", (), {"risk_level": level, "risk_factors": [], "file_changes": []})()
-
-
-@pytest.mark.asyncio
-async def test_non_interactive_approves_low_and_medium(safe_agent: SafeAgent) -> None:
-    safe_agent.non_interactive = True
-    safe_agent.fail_on_risk = None
-
-    for level in (RiskLevel.LOW, RiskLevel.MEDIUM):
-        with patch.object(
-            safe_agent.analyzer,
-            "analyze",
-            new_callable=AsyncMock,
-            return_value=_mock_preview(level),
-        ):
-            approved = await safe_agent._preview_and_approve(
-                {"action": "modify", "path": "foo.py", "description": "x", "content": "x"}
-            )
-        assert approved is True
-
-
-@pytest.mark.asyncio
-async def test_non_interactive_rejects_high_and_critical(safe_agent: SafeAgent) -> None:
+_LOW, _MEDIUM, _HIGH, _CRITICAL = (
+    RiskLevel.LOW,
+    RiskLevel.MEDIUM,
+    RiskLevel.HIGH,
+    RiskLevel.CRITICAL,
+)
+
+# (analyzed level, --fail-on-risk, expected approval, expected risk_policy_failed)
+_CASES = [
+    (_LOW, None, True, False),
+    (_MEDIUM, None, True, False),
+    (_HIGH, None, False, False),
+    (_CRITICAL, None, False, False),
+    (_LOW, _HIGH, True, False),
+    (_MEDIUM, _HIGH, True, False),
+    (_HIGH, _HIGH, False, True),
+    (_CRITICAL, _HIGH, False, True),
+    (_LOW, _CRITICAL, True, False),
+    (_MEDIUM, _CRITICAL, True, False),
+    (_HIGH, _CRITICAL, False, False),
+    (_CRITICAL, _CRITICAL, False, True),
+]
+
+
+@pytest.mark.parametrize(
+    ("level", "fail_on", "expected_approved", "expected_failed"),
+    _CASES,
+    ids=[f"{lvl.value}-fail-on-{getattr(fail_on, 'value', 'none')}" for lvl, fail_on, *_ in _CASES],
+)
+async def test_non_interactive_risk_policy(
+    safe_agent: SafeAgent,
+    level: RiskLevel,
+    fail_on: RiskLevel | None,
+    expected_approved: bool,
+    expected_failed: bool,
+) -> None:
     safe_agent.non_interactive = True
-    safe_agent.fail_on_risk = None
-
-    for level in (RiskLevel.HIGH, RiskLevel.CRITICAL):
-        with patch.object(
-            safe_agent.analyzer,
-            "analyze",
-            new_callable=AsyncMock,
-            return_value=_mock_preview(level),
-        ):
-            approved = await safe_agent._preview_and_approve(
-                {"action": "modify", "path": "foo.py", "description": "x", "content": "x"}
-            )
-        assert approved is False
-
-
-@pytest.mark.asyncio
-async def test_fail_on_risk_blocks_changes_and_marks_run_failed(safe_agent: SafeAgent) -> None:
+    safe_agent.fail_on_risk = fail_on
+    safe_agent.analyzer.analyze = async_return(PREVIEWS[level])
+
+    approved = await safe_agent._preview_and_approve(ACTION)
+
+    assert approved is expected_approved
+    assert safe_agent.risk_policy_failed is expected_failed
+
+
+async def _analyzer_not_called(*args: object, **kwargs: object) -> object:
+    raise AssertionError("analyzer.analyze should not run for a pre-rejected change")
+
+
+@pytest.mark.parametrize(
+    ("change", "expected_outcome"),
+    [
+        pytest.param(
+            {"action": "modify", "path": "../outside.py", "content": "x"},
+            "blocked_unsafe_path",
+            id="unsafe-path",
+        ),
+        pytest.param(
+            {"action": "chmod", "path": "foo.py", "content": "x"},
+            "blocked_unknown_action",
+            id="unknown-action",
+        ),
+    ],
+)
+async def test_rejects_before_analysis(
+    safe_agent: SafeAgent, change: dict, expected_outcome: str
+) -> None:
     safe_agent.non_interactive = True
-    safe_agent.fail_on_risk = RiskLevel.HIGH
+    safe_agent.analyzer.analyze = _analyzer_not_called
 
-    with patch.object(
-        safe_agent.analyzer,
-        "analyze",
-        new_callable=AsyncMock,
-        return_value=_mock_preview(RiskLevel.HIGH),
-    ):
-        approved = await safe_agent._preview_and_approve(
-            {"action": "modify", "path": "foo.py", "description": "x", "content": "x"}
-        )
+    approved = await safe_agent._preview_and_approve(change)
 
     assert approved is False
-    assert safe_agent.risk_policy_failed is True
-
-
-@pytest.mark.asyncio
-async def test_fail_on_risk_allows_lower_risk(safe_agent: SafeAgent) -> None:
-    safe_agent.non_interactive = True
-    safe_agent.fail_on_risk = RiskLevel.HIGH
-
-    with patch.object(
-        safe_agent.analyzer,
-        "analyze",
-        new_callable=AsyncMock,
-        return_value=_mock_preview(RiskLevel.MEDIUM),
-    ):
-        approved = await safe_agent._preview_and_approve(
-            {"action": "modify", "path": "foo.py", "description": "x", "content": "x"}
-        )
-
-    assert approved is True
-    assert safe_agent.risk_policy_failed is False
-
+    assert safe_agent._outcome_counts[expected_outcome] == 1